@@ -0,0 +1,32 @@
+''' Glyph substitution caches must not leak between script/language systems '''
+import ziamath as zm
+from ziamath.nodes.nodetools import _subglyph_id
+from ziamath.nodes.moperator import _layout_operator
+
+
+TEXT_SUB = r'\overbrace{x_1+\cdots+x_n}^{n\rm\ times}_{\text{(note here)}}'
+SCRIPT_PAREN = r'\left(\frac{A}{B}\middle\Vert C_{(A \mid B)\left(A\middle|B\right)}\right)'
+
+
+def clear_caches():
+    _subglyph_id.cache_clear()
+    _layout_operator.cache_clear()
+
+
+def test_text_then_script():
+    ''' Mtext switches the font to the DFLT script. Substitutions made
+        there must not be reused for scripted operators in math.
+    '''
+    clear_caches()
+    expected = zm.Latex(SCRIPT_PAREN).getsize()
+    clear_caches()
+    zm.Latex(TEXT_SUB).getsize()
+    assert zm.Latex(SCRIPT_PAREN).getsize() == expected
+
+
+def test_script_then_text():
+    clear_caches()
+    expected = zm.Latex(TEXT_SUB).getsize()
+    clear_caches()
+    zm.Latex(SCRIPT_PAREN).getsize()
+    assert zm.Latex(TEXT_SUB).getsize() == expected
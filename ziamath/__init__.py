@@ -1,18 +1,40 @@
-from .mathtable import MathTable
+from typing import TYPE_CHECKING
+import importlib
+
 from .styles import styledchr, styledstr
-from .zmath import Math, Latex, Text, declareoperator
 from .config import config
 
+if TYPE_CHECKING:
+    from .mathtable import MathTable
+    from .zmath import Math, Latex, Text, declareoperator, declareoperators
+
 __version__ = '0.8.1'
 
+__all__ = ['MathTable', 'styledchr', 'styledstr', 'Math', 'Latex', 'Text',
+           'declareoperator', 'declareoperators', 'config']
+
+# Names loaded on first access. Importing zmath pulls in latex2mathml
+# and loads the default math font, so defer it until actually needed.
+_lazy = {'MathTable': 'mathtable',
+         'Math': 'zmath',
+         'Latex': 'zmath',
+         'Text': 'zmath',
+         'declareoperator': 'zmath',
+         'declareoperators': 'zmath'}
+_submodules = {'zmath', 'mathtable', 'mathfont', 'drawable', 'nodes',
+               'escapes', 'operators'}
+
+
+def __getattr__(name: str):
+    if name in _lazy:
+        module = importlib.import_module(f'.{_lazy[name]}', __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    if name in _submodules:
+        return importlib.import_module(f'.{name}', __name__)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
 
-declareoperator(r'\tg')
-declareoperator(r'\ctg')
-declareoperator(r'\arcctg')
-declareoperator(r'\arctg')
-declareoperator(r'\arg')
-declareoperator(r'\cotg')
-declareoperator(r'\sh')
-declareoperator(r'\ch')
-declareoperator(r'\cth')
-declareoperator(r'\th')
+def __dir__():
+    return sorted(set(globals()) | set(_lazy) | _submodules)
@@ -1,11 +1,15 @@
 ''' Global configuration options '''
 from typing import Optional
+import sys
 from dataclasses import dataclass, field
 
 from ziafont import config as zfconfig
 
+# Slotted dataclasses avoid per-instance __dict__ lookups (Python 3.10+)
+_slots = {'slots': True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(**_slots)
 class DebugConfig:
     baseline: bool = False
     bbox: bool = False
@@ -19,7 +23,7 @@ class DebugConfig:
         self.bbox = False
 
 
-@dataclass
+@dataclass(**_slots)
 class TextStyle:
     textfont: Optional[str] = None
     variant: str = 'serif'
@@ -28,7 +32,7 @@ class TextStyle:
     linespacing: float = 1
 
 
-@dataclass
+@dataclass(**_slots)
 class MathStyle:
     mathfont: Optional[str] = None
     variant: str = ''
@@ -37,7 +41,7 @@ class MathStyle:
     background: str = 'none'
 
 
-@dataclass
+@dataclass(**_slots)
 class Config:
     ''' Global configuration options for Ziamath
 
@@ -55,7 +59,7 @@ class Config:
     math: MathStyle = field(default_factory=MathStyle)
     text: TextStyle = field(default_factory=TextStyle)
     minsizefraction: float = .3
-    decimal_separator = '.'
+    decimal_separator: str = '.'
     debug: DebugConfig = field(default_factory=DebugConfig)
 
     @property
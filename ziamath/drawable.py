@@ -1,16 +1,69 @@
 from __future__ import annotations
 from typing import Optional
 import math
+from functools import lru_cache
+from copy import deepcopy
+from weakref import WeakKeyDictionary
 import xml.etree.ElementTree as ET
 
 from ziafont.fonttypes import BBox
 from ziafont.glyph import SimpleGlyph, fmt
+from ziafont import config as zfconfig
 from .config import config
 from .styles import MathStyle
 
 
+@lru_cache(maxsize=256)
+def _fmtsize(value: float, precision: float) -> str:
+    ''' Format a size that doesn't depend on drawing position. Cached
+        since line widths and lengths repeat across drawables.
+    '''
+    return fmt(value)
+
+
+def fmtsize(value: float) -> str:
+    ''' Format a size (width, height, line width) for SVG '''
+    return _fmtsize(value, zfconfig.precision)
+
+
+@lru_cache(maxsize=1024)
+def _svgsymbol(glyph: SimpleGlyph, precision: float) -> ET.Element:
+    return glyph.svgsymbol()
+
+
+def svgsymbol(glyph: SimpleGlyph) -> ET.Element:
+    ''' Get <symbol> element for the glyph. Building the path is costly,
+        so symbols are cached and copied for each SVG they go into.
+    '''
+    return deepcopy(_svgsymbol(glyph, zfconfig.precision))
+
+
+# Shared style for drawables created without one. Drawables never modify their style.
+DEFAULT_STYLE = MathStyle()
+
+# IDs of <symbol> elements already in each SVG element
+_symbolids: WeakKeyDictionary[ET.Element, set[str]] = WeakKeyDictionary()
+
+
+def has_symbol(svg: ET.Element, symid: str) -> bool:
+    ''' Determine whether the svg already contains a <symbol> with the id '''
+    symids = _symbolids.get(svg)
+    if symids is None:
+        # First time drawing on this svg. Pick up any symbols added elsewhere
+        # (e.g. ziafont); after that, add_symbol keeps the set current.
+        symids = _symbolids[svg] = {sym.attrib.get('id') for sym in svg.findall('symbol')}
+    return symid in symids
+
+
+def add_symbol(svg: ET.Element, symbol: ET.Element) -> None:
+    ''' Append the <symbol> element to the svg '''
+    svg.append(symbol)
+    _symbolids.setdefault(svg, set()).add(symbol.attrib.get('id'))
+
+
 class Drawable:
     ''' Base class for drawable nodes '''
+    __slots__ = ('bbox',)
     mtag = 'drawable'
     nodes: list[Drawable] = []
 
@@ -47,21 +100,22 @@ class Glyph(Drawable):
             size: point size
             style: font MathStyle
     '''
+    __slots__ = ('glyph', 'char', 'size', 'phantom', 'style', '_funits_to_pts', '_xadvance')
+
     def __init__(self, glyph: SimpleGlyph, char: str, size: float,
-                 style: MathStyle = None, **kwargs):
+                 style: MathStyle = None, phantom: bool = False, **kwargs):
         super().__init__()
         self.glyph = glyph
         self.char = char
         self.size = size
-        self.phantom = kwargs.get('phantom', False)
-        self.style = style if style else MathStyle()
-        self._funits_to_pts = self.size / self.glyph.font.info.layout.unitsperem
-        self.bbox = BBox(
-            self.funit_to_points(self.glyph.path.bbox.xmin),
-            self.funit_to_points(self.glyph.path.bbox.xmax),
-            self.funit_to_points(self.glyph.path.bbox.ymin),
-            self.funit_to_points(self.glyph.path.bbox.ymax))
-        
+        self.phantom = phantom
+        self.style = style if style else DEFAULT_STYLE
+        self._funits_to_pts = scale = self.size / self.glyph.font.info.layout.unitsperem
+        bbox = self.glyph.path.bbox
+        self.bbox = BBox(bbox.xmin * scale, bbox.xmax * scale,
+                         bbox.ymin * scale, bbox.ymax * scale)
+        self._xadvance = self.glyph.advance() * scale
+
     def funit_to_points(self, value: float) -> float:
         ''' Convert font units to SVG points '''
         return value * self._funits_to_pts
@@ -80,7 +134,7 @@ class Glyph(Drawable):
 
     def xadvance(self) -> float:
         ''' X-advance for the glyph. Usually bbox.xmax '''
-        return self.funit_to_points(self.glyph.advance())
+        return self._xadvance
 
     def draw(self, x: float, y: float, svg: ET.Element) -> tuple[float, float]:
         ''' Draw the node on the SVG
@@ -90,30 +144,46 @@ class Glyph(Drawable):
                 y: Vertical position in SVG coordinates
                 svg: SVG drawing as XML
         '''
-        symbols = svg.findall('symbol')
-        symids = [sym.attrib.get('id') for sym in symbols]
-        if self.glyph.id not in symids and config.svg2:
-            svg.append(self.glyph.svgsymbol())
+        if config.svg2 and not has_symbol(svg, self.glyph.id):
+            add_symbol(svg, svgsymbol(self.glyph))
         if not self.phantom:
             path = self.glyph.place(x, y, self.size)
             if path is not None:
                 svg.append(path)
             if self.style.mathcolor and len(svg) > 0:
                 svg[-1].set('fill', str(self.style.mathcolor))
-        x += self.funit_to_points(self.glyph.advance())
+        x += self._xadvance
         return x, y
 
 
+def glyphnode(glyph: SimpleGlyph, char: str, size: float,
+              style: MathStyle = None, phantom: bool = False) -> Glyph:
+    ''' Get a Glyph drawable. Glyphs are never modified after construction
+        and only use the style's color, so one is shared by every node
+        drawing the same glyph at the same size and color.
+    '''
+    color = (style if style else DEFAULT_STYLE).mathcolor
+    return _glyphnode(glyph, char, size, color, phantom)
+
+
+@lru_cache(maxsize=2048)
+def _glyphnode(glyph: SimpleGlyph, char: str, size: float,
+               color: str, phantom: bool) -> Glyph:
+    return Glyph(glyph, char, size, MathStyle(mathcolor=color), phantom)
+
+
 class HLine(Drawable):
     ''' Horizontal Line. '''
+    __slots__ = ('length', 'lw', 'phantom', 'style')
+
     def __init__(self, length: float, lw: float,
-                 style: MathStyle = None, **kwargs):
+                 style: MathStyle = None, phantom: bool = False, **kwargs):
         super().__init__()
         self.length = length
         self.lw = lw
-        self.phantom = kwargs.get('phantom', False)
+        self.phantom = phantom
         self.bbox = BBox(0, self.length, -self.lw/2, self.lw/2)
-        self.style = style if style else MathStyle()
+        self.style = style if style else DEFAULT_STYLE
 
     def draw(self, x: float, y: float, svg: ET.Element) -> tuple[float, float]:
         ''' Draw the node on the SVG
@@ -126,11 +196,10 @@ class HLine(Drawable):
         if not self.phantom:
             # Use rectangle so it can change color with 'fill' attribute
             # and not mess up glyphs with 'stroke' attribute
-            bar = ET.SubElement(svg, 'rect')
-            bar.attrib['x'] = fmt(x)
-            bar.attrib['y'] = fmt(y)
-            bar.attrib['width'] = fmt(self.length)
-            bar.attrib['height'] = fmt(self.lw)
+            bar = ET.SubElement(svg, 'rect', {'x': fmt(x),
+                                              'y': fmt(y),
+                                              'width': fmtsize(self.length),
+                                              'height': fmtsize(self.lw)})
             if self.style.mathcolor:
                 bar.attrib['fill'] = str(self.style.mathcolor)
         return x+self.length, y
@@ -138,14 +207,16 @@ class HLine(Drawable):
 
 class VLine(Drawable):
     ''' Vertical Line. '''
+    __slots__ = ('height', 'lw', 'phantom', 'style')
+
     def __init__(self, height: float, lw: float,
-                 style: MathStyle = None, **kwargs):
+                 style: MathStyle = None, phantom: bool = False, **kwargs):
         super().__init__()
         self.height = height
         self.lw = lw
-        self.phantom = kwargs.get('phantom', False)
+        self.phantom = phantom
         self.bbox = BBox(0, self.lw, 0, self.height)
-        self.style = style if style else MathStyle()
+        self.style = style if style else DEFAULT_STYLE
 
     def draw(self, x: float, y: float, svg: ET.Element) -> tuple[float, float]:
         ''' Draw the node on the SVG
@@ -158,11 +229,10 @@ class VLine(Drawable):
         if not self.phantom:
             # Use rectangle so it can change color with 'fill' attribute
             # and not mess up glyphs with 'stroke' attribute
-            bar = ET.SubElement(svg, 'rect')
-            bar.attrib['x'] = fmt(x-self.lw/2)
-            bar.attrib['y'] = fmt(y)
-            bar.attrib['width'] = fmt(self.lw)
-            bar.attrib['height'] = fmt(self.height)
+            bar = ET.SubElement(svg, 'rect', {'x': fmt(x-self.lw/2),
+                                              'y': fmt(y),
+                                              'width': fmtsize(self.lw),
+                                              'height': fmtsize(self.height)})
             if self.style.mathcolor:
                 bar.attrib['fill'] = str(self.style.mathcolor)
         return x, y
@@ -170,17 +240,19 @@ class VLine(Drawable):
 
 class Box(Drawable):
     ''' Box '''
+    __slots__ = ('width', 'height', 'cornerradius', 'lw', 'phantom', 'style')
+
     def __init__(self, width: float, height: float, lw: float,
                  cornerradius: float = None,
-                 style: MathStyle = None, **kwargs):
+                 style: MathStyle = None, phantom: bool = False, **kwargs):
         super().__init__()
         self.width = width
         self.height = height
         self.cornerradius = cornerradius
         self.lw = lw
-        self.phantom = kwargs.get('phantom', False)
+        self.phantom = phantom
         self.bbox = BBox(0, self.width, 0, self.height)
-        self.style = style if style else MathStyle()
+        self.style = style if style else DEFAULT_STYLE
 
     def draw(self, x: float, y: float, svg: ET.Element) -> tuple[float, float]:
         ''' Draw the node on the SVG
@@ -191,33 +263,34 @@ class Box(Drawable):
                 svg: SVG drawing as XML
         '''
         if not self.phantom:
-            bar = ET.SubElement(svg, 'rect')
-            bar.set('x', fmt(x))
-            bar.set('y', fmt(y-self.height))
-            bar.set('width', fmt(self.width))
-            bar.set('height', fmt(self.height))
-            bar.set('stroke-width', fmt(self.lw))
-            bar.set('stroke', self.style.mathcolor)
-            bar.set('fill', self.style.mathbackground)
+            bar = ET.SubElement(svg, 'rect', {'x': fmt(x),
+                                              'y': fmt(y-self.height),
+                                              'width': fmtsize(self.width),
+                                              'height': fmtsize(self.height),
+                                              'stroke-width': fmtsize(self.lw),
+                                              'stroke': self.style.mathcolor,
+                                              'fill': self.style.mathbackground})
             if self.cornerradius:
-                bar.set('rx', fmt(self.cornerradius))
+                bar.set('rx', fmtsize(self.cornerradius))
 
         return x+self.width, y
 
 
 class Diagonal(Drawable):
     ''' Diagonal Line - corners of Box '''
+    __slots__ = ('width', 'height', 'lw', 'arrow', 'phantom', 'style', 'arroww', 'arrowh')
+
     def __init__(self, width: float, height: float, lw: float,
                  arrow: bool = False,
-                 style: MathStyle = None, **kwargs):
+                 style: MathStyle = None, phantom: bool = False, **kwargs):
         super().__init__()
         self.width = width
         self.height = height
         self.lw = lw
         self.arrow = arrow
-        self.phantom = kwargs.get('phantom', False)
+        self.phantom = phantom
         self.bbox = BBox(0, self.width, 0, self.height)
-        self.style = style if style else MathStyle()
+        self.style = style if style else DEFAULT_STYLE
 
         self.arroww = self.width
         self.arrowh = self.height
@@ -237,21 +310,21 @@ class Diagonal(Drawable):
         '''
         if not self.phantom:
             bar = ET.SubElement(svg, 'path')
-            if self.arrow:
+            if self.arrow and svg.find("defs/marker[@id='arrowhead']") is None:
+                # Only need one arrowhead definition per svg
                 arrowdef = ET.SubElement(svg, 'defs')
-                marker = ET.SubElement(arrowdef, 'marker')
-                marker.set('id', 'arrowhead')
-                marker.set('markerWidth', '10')
-                marker.set('markerHeight', '7')
-                marker.set('refX', '0')
-                marker.set('refY', '3.5')
-                marker.set('orient', 'auto')
-                poly = ET.SubElement(marker, 'polygon')
-                poly.set('points', '0 0 10 3.5 0 7')
-
-            bar.set('d', f'M {fmt(x)} {fmt(y-self.height)} L {fmt(x+self.width)} {fmt(y)}')
-            bar.set('stroke-width', fmt(self.lw))
-            bar.set('stroke', self.style.mathcolor)
+                marker = ET.SubElement(arrowdef, 'marker', {'id': 'arrowhead',
+                                                            'markerWidth': '10',
+                                                            'markerHeight': '7',
+                                                            'refX': '0',
+                                                            'refY': '3.5',
+                                                            'orient': 'auto'})
+                ET.SubElement(marker, 'polygon', {'points': '0 0 10 3.5 0 7'})
+
+            bar.attrib.update({
+                'd': f'M {fmt(x)} {fmt(y-self.height)} L {fmt(x+self.width)} {fmt(y)}',
+                'stroke-width': fmtsize(self.lw),
+                'stroke': self.style.mathcolor})
             if self.arrow:
                 bar.set('marker-end', 'url(#arrowhead)')
 
@@ -260,15 +333,17 @@ class Diagonal(Drawable):
 
 class Ellipse(Drawable):
     ''' Ellipse '''
+    __slots__ = ('width', 'height', 'lw', 'phantom', 'style')
+
     def __init__(self, width: float, height: float, lw: float,
-                 style: MathStyle = None, **kwargs):
+                 style: MathStyle = None, phantom: bool = False, **kwargs):
         super().__init__()
         self.width = width
         self.height = height
         self.lw = lw
-        self.phantom = kwargs.get('phantom', False)
+        self.phantom = phantom
         self.bbox = BBox(0, self.width, 0, self.height)
-        self.style = style if style else MathStyle()
+        self.style = style if style else DEFAULT_STYLE
 
     def draw(self, x: float, y: float, svg: ET.Element) -> tuple[float, float]:
         ''' Draw the node on the SVG
@@ -279,12 +354,11 @@ class Ellipse(Drawable):
                 svg: SVG drawing as XML
         '''
         if not self.phantom:
-            bar = ET.SubElement(svg, 'ellipse')
-            bar.set('cx', fmt(x+self.width/2))
-            bar.set('cy', fmt(y-self.height/2))
-            bar.set('rx', fmt(self.width/2))
-            bar.set('ry', fmt(self.height/2))
-            bar.set('stroke-width', fmt(self.lw))
-            bar.set('stroke', self.style.mathcolor)
-            bar.set('fill', self.style.mathbackground)
+            ET.SubElement(svg, 'ellipse', {'cx': fmt(x+self.width/2),
+                                           'cy': fmt(y-self.height/2),
+                                           'rx': fmtsize(self.width/2),
+                                           'ry': fmtsize(self.height/2),
+                                           'stroke-width': fmtsize(self.lw),
+                                           'stroke': self.style.mathcolor,
+                                           'fill': self.style.mathbackground})
         return x+self.width, y
@@ -5,6 +5,7 @@ before parsing.
 '''
 
 import re
+from functools import lru_cache
 from . import escape_codes
 
 ESCAPES = escape_codes.ESCAPES
@@ -21,16 +22,36 @@ ESCAPES.update({
     # '&amp;': '&',
     })
 
-regex = re.compile('|'.join(map(re.escape, ESCAPES.keys())))
+# Named entities all look like &name;, so match them generically and
+# look up the replacement, rather than alternating over every name.
+_ENTITY = r'&[A-Za-z0-9]+;'
+_OTHERS = [k for k in ESCAPES if not re.fullmatch(_ENTITY, k)]
+regex = re.compile('|'.join([_ENTITY] + [re.escape(k) for k in _OTHERS]))
+_mn_minus = re.compile(r'<mn.*>\s*-')
+_mo_minus = re.compile(r'<mo.*>\s*-\s*</mo>')
 
 
-def unescape(xmlstr: str) -> str:
-    ''' Remove MathML escape codes from xml string '''
-    xml = regex.sub(lambda match: ESCAPES[match.group(0)], xmlstr)
+def _replace(match: re.Match) -> str:
+    escape = match.group(0)
+    return ESCAPES.get(escape, escape)
+
+
+def _unescape(xmlstr: str) -> str:
+    xml = regex.sub(_replace, xmlstr)
 
     # Replace hyphens with real minus signs, but only within numbers/operators
     # (due to re.escape, the compiled regex used above won't
     #  work for these substitutions)
-    xml = re.sub(r'<mn.*>\s*-', '<mn>−', xml)
-    xml = re.sub(r'<mo.*>\s*-\s*</mo>', '<mo> − </mo>', xml)
+    xml = _mn_minus.sub('<mn>−', xml)
+    xml = _mo_minus.sub('<mo> − </mo>', xml)
     return xml
+
+
+_unescape_cached = lru_cache(maxsize=256)(_unescape)
+
+
+def unescape(xmlstr: str) -> str:
+    ''' Remove MathML escape codes from xml string '''
+    if len(xmlstr) < 4096:  # Don't hold on to large documents
+        return _unescape_cached(xmlstr)
+    return _unescape(xmlstr)
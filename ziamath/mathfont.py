@@ -3,10 +3,12 @@
 from __future__ import annotations
 from typing import Union
 from pathlib import Path
+from functools import cached_property, lru_cache
 
 from ziafont import Font
+from ziafont.glyph import SimpleGlyph
 
-from .mathtable import MathTable
+from .mathtable import MathTable, MathConstants
 
 
 class MathFont(Font):
@@ -19,10 +21,46 @@ class MathFont(Font):
     def __init__(self, fname: Union[str, Path], basesize: float = 24):
         super().__init__(fname)
         self.basesize = basesize
-        if 'MATH' not in self.tables:
+        self.unitsperem = self.info.layout.unitsperem
+        mathtable = self.tables.get('MATH')
+        if mathtable is None:
             raise ValueError('Font has no MATH table!')
+        self._mathtable = mathtable
 
-        self.math = MathTable(self)
         self.features.ssty = True  # Enable math script variants
         if 'math' in self.scripts():
             self.language('math', '')
+        self._charglyphs: dict[str, SimpleGlyph] = {}
+
+    def glyph(self, char: str) -> SimpleGlyph:
+        ''' Get the Glyph for the character '''
+        glyph = self._charglyphs.get(char)
+        if glyph is None:
+            glyph = self._charglyphs[char] = super().glyph(char)
+        return glyph
+
+    @cached_property
+    def math(self) -> MathTable:
+        ''' MATH table, read on first access '''
+        return MathTable(self, self._mathtable.offset, self._mathtable.length)
+
+    @cached_property
+    def consts(self) -> MathConstants:
+        ''' MATH table constants '''
+        return self.math.consts
+
+
+@lru_cache(maxsize=8)
+def _load_mathfont(fname: Path, basesize: float) -> MathFont:
+    return MathFont(fname, basesize)
+
+
+def load_mathfont(fname: Union[str, Path], basesize: float = 24) -> MathFont:
+    ''' Load a MathFont, reusing an already-parsed instance when the same
+        font file has been loaded before.
+
+        Args:
+            fname: File name of font
+            basesize: Default font size
+    '''
+    return _load_mathfont(Path(fname).resolve(), basesize)
@@ -5,8 +5,11 @@
 
 from __future__ import annotations
 from typing import Union, Sequence, Optional, TYPE_CHECKING
-from collections import namedtuple
+import struct
+from math import ceil, inf
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass
+from functools import cached_property, lru_cache
 import xml.etree.ElementTree as ET
 
 from ziafont.gpos import Coverage
@@ -19,12 +22,33 @@ if TYPE_CHECKING:
 
 
 GlyphType = Union[SimpleGlyph, CompoundGlyph]
+KernType = Union['MathKernTable', 'ZeroKern']
 
-MathKernInfoRecord = namedtuple(
-    'MathKernInfoRecord', ['topright', 'topleft', 'bottomright', 'bottomleft'])
-GlyphPartRecord = namedtuple(
-    'GlyphPartRecord', ['glyphId', 'startConnectorLength', 'endConnectorLength',
-                        'fullAdvance', 'partFlags'])
+
+class MathKernInfoRecord:
+    ''' Kerning tables for the four corners of a glyph '''
+    __slots__ = ('topright', 'topleft', 'bottomright', 'bottomleft')
+
+    def __init__(self, topright: KernType, topleft: KernType,
+                 bottomright: KernType, bottomleft: KernType):
+        self.topright = topright
+        self.topleft = topleft
+        self.bottomright = bottomright
+        self.bottomleft = bottomleft
+
+
+class GlyphPartRecord:
+    ''' One part of a glyph assembly '''
+    __slots__ = ('glyphId', 'startConnectorLength', 'endConnectorLength',
+                 'fullAdvance', 'partFlags')
+
+    def __init__(self, glyphId: int, startConnectorLength: int,
+                 endConnectorLength: int, fullAdvance: int, partFlags: int):
+        self.glyphId = glyphId
+        self.startConnectorLength = startConnectorLength
+        self.endConnectorLength = endConnectorLength
+        self.fullAdvance = fullAdvance
+        self.partFlags = partFlags
 
 
 def read_valuerecord(fontfile: FontReader) -> int:
@@ -34,6 +58,44 @@ def read_valuerecord(fontfile: FontReader) -> int:
     return value
 
 
+def read_valuerecords(fontfile: FontReader, count: int) -> tuple[int, ...]:
+    ''' Read count consecutive Math Value Records. deviceOffsets are ignored. '''
+    return struct.unpack('>' + 'hH'*count, fontfile.read(4*count))[::2]
+
+
+class CachedCoverage(Coverage):
+    ''' Coverage Table with a glyph-to-index dictionary built at load,
+        so lookups don't scan the glyph list or ranges
+
+        Args:
+            ofst: Byte offset into MATH table reader
+            fontfile: MATH table reader
+            nulltable: Set true if this table is null
+    '''
+    def __init__(self, ofst: int, fontfile: FontReader, nulltable: bool = False):
+        super().__init__(ofst, fontfile, nulltable=nulltable)
+        self._idx: dict[int, int] = {}
+        if self.nulltable:
+            return
+
+        # setdefault keeps the first match, same as a linear scan would
+        if self.format == 1:
+            for i, glyph in enumerate(self.glyphs):
+                self._idx.setdefault(glyph, i)
+        else:
+            for r in self.ranges:
+                for glyph in range(r.startglyph, r.endglyph+1):
+                    self._idx.setdefault(glyph, r.covidx + (glyph - r.startglyph))
+
+    def covidx(self, glyph: int) -> Optional[int]:
+        ''' Get coverage index for this glyph, or None if not in the coverage range '''
+        return self._idx.get(glyph)
+
+
+# MathConstants layout: 2 int16, 2 uint16, 51 MathValueRecords, 1 int16
+_CONSTS_STRUCT = struct.Struct('>hhHH' + 'hH'*51 + 'h')
+
+
 @dataclass
 class MathConstants:
     ''' Data from the Math Constants Table '''
@@ -101,154 +163,125 @@ class MathTable:
 
         Args:
             font: Math Font
+            ofst: Offset of MATH table in the font file, looked up
+                from the font's table directory if not provided
+            length: Length of MATH table in bytes, looked up from the
+                font's table directory if not provided
     '''
-    def __init__(self, font: 'MathFont'):
+    def __init__(self, font: 'MathFont', ofst: Optional[int] = None,
+                 length: Optional[int] = None):
         self.font = font
-        self.ofst = font.tables['MATH'].offset
-        self.fontfile = self.font.fontfile
-        self.fontfile.seek(self.ofst)
+        self.ofst = font.tables['MATH'].offset if ofst is None else ofst
+        length = font.tables['MATH'].length if length is None else length
+        # Parse from a separate reader holding only the MATH table, so
+        # offsets below are relative to the start of the table and the
+        # font's own reader position is left alone.
+        with font.fontfile.getbuffer() as buf:
+            self.fontfile = FontReader(bytes(buf[self.ofst:self.ofst+length]))
+        self.fontfile.seek(0)
         self.vermajor = self.fontfile.readuint16()
         self.verminor = self.fontfile.readuint16()
         assert self.vermajor == 1
-        constsofst = self.fontfile.readuint16()
-        glyphofst = self.fontfile.readuint16()
-        variantsofst = self.fontfile.readuint16()
-        self._readconsts(constsofst)
-        self._readglyphinfo(glyphofst)
-        self._readvariants(variantsofst)
-
-    def _readconsts(self, ofst: int) -> None:
+        # Subtables are only parsed when first accessed
+        self._constsofst = self.fontfile.readuint16()
+        self._glyphofst = self.fontfile.readuint16()
+        self._variantsofst = self.fontfile.readuint16()
+        self._kernsupercache: dict[tuple[int, int], tuple[int, int]] = {}
+        self._kernsubcache: dict[tuple[int, int], tuple[int, int]] = {}
+
+    @cached_property
+    def consts(self) -> MathConstants:
+        ''' Math Constants table '''
+        return self._readconsts(self._constsofst)
+
+    # Each subtable is only parsed when first accessed
+
+    @cached_property
+    def _glyphinfoofsts(self) -> tuple[int, int, int, int]:
+        ''' Offsets of italics, top accent, extended shape, and kern info tables '''
+        self.fontfile.seek(self._glyphofst)
+        return struct.unpack('>HHHH', self.fontfile.read(8))
+
+    @cached_property
+    def italicsCorrection(self) -> MathSubTable:
+        ''' Italics correction values '''
+        return self._readvaluetable(self._glyphinfoofsts[0])
+
+    @cached_property
+    def topAccentAttachment(self) -> MathSubTable:
+        ''' Top accent attachment values '''
+        return self._readvaluetable(self._glyphinfoofsts[1])
+
+    @cached_property
+    def _extendedShapeCoverage(self) -> Coverage:
+        extendshape = self._glyphinfoofsts[2]
+        return CachedCoverage(
+            self._glyphofst+extendshape, self.fontfile, nulltable=(extendshape==0))
+
+    @cached_property
+    def kernInfo(self) -> Optional[MathKernInfoTable]:
+        ''' Math kerning info table '''
+        kernofst = self._glyphinfoofsts[3]
+        if kernofst:
+            return MathKernInfoTable(self._glyphofst+kernofst, self.fontfile)
+        return None
+
+    @cached_property
+    def _variantsheader(self) -> tuple[int, int, int, int, int]:
+        ''' minConnectorOverlap, vertical and horizontal coverage offsets,
+            and vertical and horizontal glyph counts
+        '''
+        self.fontfile.seek(self._variantsofst)
+        return struct.unpack('>HHHHH', self.fontfile.read(10))
+
+    @cached_property
+    def _variantsvert(self) -> MathVariants:
+        minoverlap, vertcovofst, _, vertcount, _ = self._variantsheader
+        return self._readvariants(self._variantsofst+10, vertcount, vertcovofst,
+                                  minoverlap, vert=True)
+
+    @cached_property
+    def _variantshorz(self) -> MathVariants:
+        minoverlap, _, horzcovofst, vertcount, horzcount = self._variantsheader
+        return self._readvariants(self._variantsofst+10+2*vertcount, horzcount, horzcovofst,
+                                  minoverlap, vert=False)
+
+    def _readconsts(self, ofst: int) -> MathConstants:
         ''' Read math constants table '''
-        self.fontfile.seek(self.ofst + ofst)
-        self.consts = MathConstants(
-            scriptPercentScaleDown=self.fontfile.readint16(),
-            scriptScriptPercentScaleDown=self.fontfile.readint16(),
-            delimitedSubFormulaMinHeight=self.fontfile.readuint16(),
-            displayOperatorMinHeight=self.fontfile.readuint16(),
-            mathLeading=read_valuerecord(self.fontfile),
-            axisHeight=read_valuerecord(self.fontfile),
-            accentBaseHeight=read_valuerecord(self.fontfile),
-            flattenedAccentBaseHeight=read_valuerecord(self.fontfile),
-            subscriptShiftDown=read_valuerecord(self.fontfile),
-            subscriptTopMax=read_valuerecord(self.fontfile),
-            subscriptBaselineDropMin=read_valuerecord(self.fontfile),
-            superscriptShiftUp=read_valuerecord(self.fontfile),
-            superscriptShiftUpCramped=read_valuerecord(self.fontfile),
-            superscriptBottomMin=read_valuerecord(self.fontfile),
-            superscriptBaselineDropMax=read_valuerecord(self.fontfile),
-            subSuperscriptGapMin=read_valuerecord(self.fontfile),
-            superscriptBottomMaxWithSubscript=read_valuerecord(self.fontfile),
-            spaceAfterScript=read_valuerecord(self.fontfile),
-            upperLimitGapMin=read_valuerecord(self.fontfile),
-            upperLimitBaselineRiseMin=read_valuerecord(self.fontfile),
-            lowerLimitGapMin=read_valuerecord(self.fontfile),
-            lowerLimitBaselineDropMin=read_valuerecord(self.fontfile),
-            stackTopShiftUp=read_valuerecord(self.fontfile),
-            stackTopDisplayStyleShiftUp=read_valuerecord(self.fontfile),
-            stackBottomShiftDown=read_valuerecord(self.fontfile),
-            stackBottomDisplayStyleShiftDown=read_valuerecord(self.fontfile),
-            stackGapMin=read_valuerecord(self.fontfile),
-            stackDisplayStyleGapMin=read_valuerecord(self.fontfile),
-            stretchStackTopShiftUp=read_valuerecord(self.fontfile),
-            stretchStackBottomShiftDown=read_valuerecord(self.fontfile),
-            stretchStackGapAboveMin=read_valuerecord(self.fontfile),
-            stretchStackGapBelowMin=read_valuerecord(self.fontfile),
-            fractionNumeratorShiftUp=read_valuerecord(self.fontfile),
-            fractionNumeratorDisplayStyleShiftUp=read_valuerecord(self.fontfile),
-            fractionDenominatorShiftDown=read_valuerecord(self.fontfile),
-            fractionDenominatorDisplayStyleShiftDown=read_valuerecord(self.fontfile),
-            fractionNumeratorGapMin=read_valuerecord(self.fontfile),
-            fractionNumDisplayStyleGapMin=read_valuerecord(self.fontfile),
-            fractionRuleThickness=read_valuerecord(self.fontfile),
-            fractionDenominatorGapMin=read_valuerecord(self.fontfile),
-            fractionDenomDisplayStyleGapMin=read_valuerecord(self.fontfile),
-            skewedFractionHorizontalGap=read_valuerecord(self.fontfile),
-            skewedFractionVerticalGap=read_valuerecord(self.fontfile),
-            overbarVerticalGap=read_valuerecord(self.fontfile),
-            overbarRuleThickness=read_valuerecord(self.fontfile),
-            overbarExtraAscender=read_valuerecord(self.fontfile),
-            underbarVerticalGap=read_valuerecord(self.fontfile),
-            underbarRuleThickness=read_valuerecord(self.fontfile),
-            underbarExtraDescender=read_valuerecord(self.fontfile),
-            radicalVerticalGap=read_valuerecord(self.fontfile),
-            radicalDisplayStyleVerticalGap=read_valuerecord(self.fontfile),
-            radicalRuleThickness=read_valuerecord(self.fontfile),
-            radicalExtraAscender=read_valuerecord(self.fontfile),
-            radicalKernBeforeDegree=read_valuerecord(self.fontfile),
-            radicalKernAfterDegree=read_valuerecord(self.fontfile),
-            radicalDegreeBottomRaisePercent=self.fontfile.readint16())
-
-    def _readglyphinfo(self, ofst: int) -> None:
-        ''' Read glyph info table '''
-        self.fontfile.seek(self.ofst + ofst)
-        # Read table offsets
-        italics = self.fontfile.readuint16()
-        topaccent = self.fontfile.readuint16()
-        extendshape = self.fontfile.readuint16()
-        kernofst = self.fontfile.readuint16()
-
-        # Italics table
-        self.fontfile.seek(self.ofst + ofst + italics)
-        covofst = self.fontfile.readuint16()
-        cnt = self.fontfile.readuint16()
-        italicscorrections = []
-        for i in range(cnt):
-            italicscorrections.append(read_valuerecord(self.fontfile))
-        italicscoverage = Coverage(self.ofst+ofst+italics+covofst,
-                                   self.fontfile, nulltable=(italics==0))
-
-        # Top Accent Attachment Table
-        self.fontfile.seek(self.ofst + ofst + topaccent)
+        self.fontfile.seek(ofst)
+        values = _CONSTS_STRUCT.unpack(self.fontfile.read(_CONSTS_STRUCT.size))
+        # MathValueRecords are (value, deviceOffset) pairs. Drop the deviceOffsets.
+        return MathConstants(*values[:4], *values[4:-1:2], values[-1])
+
+    def _readvaluetable(self, subofst: int) -> MathSubTable:
+        ''' Read italics correction or top accent attachment table
+            at subofst from the start of the glyph info table
+        '''
+        ofst = self._glyphofst + subofst
+        self.fontfile.seek(ofst)
         covofst = self.fontfile.readuint16()
         cnt = self.fontfile.readuint16()
-        accents = []
-        for i in range(cnt):
-            accents.append(read_valuerecord(self.fontfile))
-        accentcoverage = Coverage(
-            self.ofst+ofst+topaccent+covofst, self.fontfile, nulltable=(topaccent==0))
+        values = read_valuerecords(self.fontfile, cnt)
+        coverage = CachedCoverage(ofst+covofst, self.fontfile, nulltable=(subofst==0))
+        return MathSubTable(values, coverage)
 
-        # Extended Shape Coverage
-        extshapes = Coverage(
-            self.ofst+ofst+extendshape, self.fontfile, nulltable=(extendshape==0))
+    def _readvariants(self, ofst: int, count: int, covofst: int,
+                      minoverlap: int, vert: bool) -> MathVariants:
+        ''' Read one direction of the variants table
 
-        # Kern Info
-        if kernofst:
-            kerninfo = MathKernInfoTable(
-                self.ofst+ofst+kernofst, self.fontfile, nulltable=(kernofst==0))
-        else:
-            kerninfo = None
-
-        self.italicsCorrection = MathSubTable(italicscorrections, italicscoverage)
-        self.topAccentAttachment = MathSubTable(accents, accentcoverage)
-        self._extendedShapeCoverage = extshapes
-        self.kernInfo = kerninfo
-
-    def _readvariants(self, ofst: int) -> None:
-        ''' Read the variants table '''
-        self.fontfile.seek(self.ofst + ofst)
-        minoverlap = self.fontfile.readuint16()
-        vertcovofst = self.fontfile.readuint16()
-        horzcovofst = self.fontfile.readuint16()
-        vertcount = self.fontfile.readuint16()
-        horzcount = self.fontfile.readuint16()
-
-        vertConstruction = []
-        for i in range(vertcount):
-            vofst = self.fontfile.readuint16()
-            vertConstruction.append(
-                MathConstructionTable(self.ofst+ofst+vofst, self.font, vert=True))
-        horzConstruction = []
-        for i in range(horzcount):
-            hofst = self.fontfile.readuint16()
-            horzConstruction.append(
-                MathConstructionTable(self.ofst+ofst+hofst, self.font, vert=False))
-
-        vertcoverage = Coverage(self.ofst + ofst + vertcovofst, self.fontfile)
-        horzcoverage = Coverage(self.ofst + ofst + horzcovofst, self.fontfile)
-        self._variantsvert = MathVariants(
-            vertcoverage, vertConstruction, minoverlap, self.font, vert=True)
-        self._variantshorz = MathVariants(
-            horzcoverage, horzConstruction, minoverlap, self.font, vert=False)
+            Args:
+                ofst: Offset of the construction table offsets
+                count: Number of construction tables
+                covofst: Coverage offset from start of variants table
+                minoverlap: Minimum connector overlap
+                vert: Vertical or horizontal variants
+        '''
+        self.fontfile.seek(ofst)
+        construction = [
+            MathConstructionTable(self._variantsofst+cofst, self.fontfile, self.font, vert=vert)
+            for cofst, in struct.iter_unpack('>H', self.fontfile.read(2*count))]
+        coverage = CachedCoverage(self._variantsofst + covofst, self.fontfile)
+        return MathVariants(coverage, construction, minoverlap, self.font, vert=vert)
 
     def kernsuper(self, glyph1: GlyphType, glyph2: GlyphType) -> tuple[int, int]:
         ''' Calculate superscript kerning between the two glyphs
@@ -261,13 +294,22 @@ class MathTable:
                 kern: Kerning shift to apply in x direction
                 shift: Upward shift of superscript with respect to baseline
         '''
+        # Result depends only on the two glyphs. Assembled glyphs (index < 0)
+        # don't have unique indices, so they aren't cached.
+        if glyph1.index < 0 or glyph2.index < 0:
+            return self._kernsuper(glyph1, glyph2)
+        key = (glyph1.index, glyph2.index)
+        try:
+            return self._kernsupercache[key]
+        except KeyError:
+            kern = self._kernsupercache[key] = self._kernsuper(glyph1, glyph2)
+            return kern
+
+    def _kernsuper(self, glyph1: GlyphType, glyph2: GlyphType) -> tuple[int, int]:
         if self.kernInfo is None:
             return 0, max(self.consts.superscriptShiftUp,
                           self.consts.superscriptBottomMin)
 
-        glyph1_kern = self.kernInfo.glyph(glyph1.index)
-        glyph2_kern2 = self.kernInfo.glyph(glyph2.index)
-
         # Extended shape, need to raise superscript up, but only if we're using
         # a variant
         if self._extendedShapeCoverage.covidx(glyph1.index) is not None:
@@ -277,14 +319,9 @@ class MathTable:
 
         height1 = shiftup + glyph2.path.bbox.ymin * self.consts.scriptPercentScaleDown/100
         height2 = glyph1.path.bbox.ymax - shiftup
-        kern1 = kern2 = 0
-        if glyph1_kern:
-            kern1 += glyph1_kern.topright.getkern(height1)
-            kern2 += glyph1_kern.topright.getkern(height2)
-        if glyph2_kern2:
-            kern1 += glyph2_kern2.bottomleft.getkern(height1)
-            kern2 += glyph2_kern2.bottomleft.getkern(height2)
-        return min(kern1, kern2), shiftup
+        kern1, kern2 = self.kernInfo.topright(glyph1.index).getkern_pair(height1, height2)
+        k1, k2 = self.kernInfo.bottomleft(glyph2.index).getkern_pair(height1, height2)
+        return min(kern1+k1, kern2+k2), shiftup
 
     def kernsub(self, glyph1: GlyphType, glyph2: GlyphType) -> tuple[int, int]:
         ''' Calculate subscript kerning
@@ -297,25 +334,27 @@ class MathTable:
                 kern: Kerning shift to apply in x direction
                 shift: Downward shift of subscript with respect to baseline
         '''
+        if glyph1.index < 0 or glyph2.index < 0:
+            return self._kernsub(glyph1, glyph2)
+        key = (glyph1.index, glyph2.index)
+        try:
+            return self._kernsubcache[key]
+        except KeyError:
+            kern = self._kernsubcache[key] = self._kernsub(glyph1, glyph2)
+            return kern
+
+    def _kernsub(self, glyph1: GlyphType, glyph2: GlyphType) -> tuple[int, int]:
         if self.kernInfo is None:
             return 0, max(self.consts.subscriptTopMax,
                           self.consts.subscriptShiftDown)
 
-        glyph1_kern = self.kernInfo.glyph(glyph1.index)
-        glyph2_kern = self.kernInfo.glyph(glyph2.index)
-
         # Correction heights
         shiftdn = self.consts.subscriptShiftDown - glyph1.path.bbox.ymin
         height1 = -shiftdn + glyph2.path.bbox.ymax * self.consts.scriptPercentScaleDown/100
         height2 = glyph1.path.bbox.ymin + shiftdn
-        kern1 = kern2 = 0
-        if glyph1_kern:
-            kern1 += glyph1_kern.bottomright.getkern(height1)
-            kern2 += glyph1_kern.bottomright.getkern(height2)
-        if glyph2_kern:
-            kern1 += glyph2_kern.topleft.getkern(height1)
-            kern2 += glyph2_kern.topleft.getkern(height2)
-        return min(kern1, kern2), shiftdn
+        kern1, kern2 = self.kernInfo.bottomright(glyph1.index).getkern_pair(height1, height2)
+        k1, k2 = self.kernInfo.topleft(glyph2.index).getkern_pair(height1, height2)
+        return min(kern1+k1, kern2+k2), shiftdn
 
     def variant(self, glyphid: int, height: float, vert: bool = True) -> GlyphType:
         ''' Get a height variant for the glyph
@@ -359,27 +398,26 @@ class MathConstructionTable:
     ''' Math Construction Table, listing size variants for a glyph
 
         Args:
-            ofst: Byte offset to table in font file
+            ofst: Byte offset to table in MATH table reader
+            fontfile: MATH table reader
             font: Font
             vert: Vertical or horizontal variant
     '''
-    def __init__(self, ofst: int, font: 'MathFont', vert: bool = True):
-        fileptr = font.fontfile.tell()
-        font.fontfile.seek(ofst)
-        assemblyofst = font.fontfile.readuint16()
-        varcount = font.fontfile.readuint16()
-        self.variants = {}
-        for i in range(varcount):
-            varglyph = font.fontfile.readuint16()
-            advmeas = font.fontfile.readuint16()
-            self.variants[advmeas] = varglyph
+    def __init__(self, ofst: int, fontfile: FontReader, font: 'MathFont', vert: bool = True):
+        fileptr = fontfile.tell()
+        fontfile.seek(ofst)
+        assemblyofst = fontfile.readuint16()
+        varcount = fontfile.readuint16()
+        self.variants = {advmeas: varglyph for varglyph, advmeas
+                         in struct.iter_unpack('>HH', fontfile.read(4*varcount))}
+        self.sizes = tuple(sorted(self.variants))
 
         self.assembly: Optional[MathAssembly]
         if assemblyofst:
-            self.assembly = MathAssembly(ofst+assemblyofst, font, vert=vert)
+            self.assembly = MathAssembly(ofst+assemblyofst, fontfile, font, vert=vert)
         else:
             self.assembly = None
-        font.fontfile.seek(fileptr)
+        fontfile.seek(fileptr)
 
 
 class AssembledGlyph(SimpleGlyph):
@@ -405,41 +443,52 @@ class AssembledGlyph(SimpleGlyph):
         self.vert = vert
 
         if self.vert:
-            xmin = min([g.path.bbox.xmin for g in glyphs])
-            xmax = max([g.path.bbox.xmax for g in glyphs])
+            xmin, xmax = inf, -inf
+            for g in glyphs:
+                gbox = g.path.bbox
+                if gbox.xmin < xmin:
+                    xmin = gbox.xmin
+                if gbox.xmax > xmax:
+                    xmax = gbox.xmax
             ymin = int(glyphs[0].path.bbox.ymin + offsets[0])
             ymax = int(glyphs[-1].path.bbox.ymax + offsets[-1])
         else:
             xmin = int(glyphs[0].path.bbox.xmin)
             xmax = int(glyphs[-1].path.bbox.xmax + offsets[-1])
-            ymin = min([g.path.bbox.ymin for g in glyphs])
-            ymax = max([g.path.bbox.ymax for g in glyphs])
+            ymin, ymax = inf, -inf
+            for g in glyphs:
+                gbox = g.path.bbox
+                if gbox.ymin < ymin:
+                    ymin = gbox.ymin
+                if gbox.ymax > ymax:
+                    ymax = gbox.ymax
         bbox = BBox(xmin, xmax, ymin, ymax)
         super().__init__(index, [], bbox, font)
+        self._advance = xmax
 
     def advance(self, nextchr=None) -> float:
         ''' X-advance '''
-        return self.bbox.xmax
+        return self._advance
 
     def svgpath(self, x0: float = 0, y0: float = 0,
                 scale_factor: float = 1) -> Optional[ET.Element]:
         ''' Get svg <path> element for glyph, normalized to 12-point font '''
         element = ET.Element('g')
+        scale = self.funits_to_points(1, scale_factor)
+        vert = self.vert
 
         for glyph, ofst in zip(self.glyphs, self.offsets):
-            path = ''
+            dx, dy = (0, ofst) if vert else (ofst, 0)
+            segments = []
             for operator in glyph.operators:
-                if self.vert:
-                    operator = operator.xform(1, 0, 0, 1, 0, ofst, 1, 1)
-                else:
-                    operator = operator.xform(1, 0, 0, 1, ofst, 0, 1, 1)
-                segment = operator.path(x0, y0, scale=self.funits_to_points(1, scale_factor))
-                if segment[0] == 'M' and path != '':
-                    path += 'Z '  # Close intermediate segments
-                path += segment
-            if path == '':
+                segment = operator.xform(1, 0, 0, 1, dx, dy, 1, 1).path(x0, y0, scale=scale)
+                if segment[0] == 'M' and segments:
+                    segments.append('Z ')  # Close intermediate segments
+                segments.append(segment)
+            if not segments:
                 continue  # Don't add empty path
-            path += 'Z '
+            segments.append('Z ')
+            path = ''.join(segments)
             element.append(ET.Element('path', attrib={'d': path}))
         return element
 
@@ -450,24 +499,40 @@ class MathAssembly:
         curly brace)
 
         Args:
-            ofst: Byte offset into font file
+            ofst: Byte offset into MATH table reader
+            fontfile: MATH table reader
             font: Font
             vert: Vertical or horizontal variant
     '''
-    def __init__(self, ofst: int, font: 'MathFont', vert: bool = True):
+    def __init__(self, ofst: int, fontfile: FontReader, font: 'MathFont', vert: bool = True):
         self.vert = vert
         self.font = font
-        font.fontfile.seek(ofst)
-        self.italicscorrection = read_valuerecord(font.fontfile)
-        partcnt = font.fontfile.readuint16()
-        self.parts = []
-        for i in range(partcnt):
-            self.parts.append(GlyphPartRecord(
-                font.fontfile.readuint16(),
-                font.fontfile.readuint16(),
-                font.fontfile.readuint16(),
-                font.fontfile.readuint16(),
-                font.fontfile.readuint16()))
+        fontfile.seek(ofst)
+        self.italicscorrection = read_valuerecord(fontfile)
+        partcnt = fontfile.readuint16()
+        self.parts = [GlyphPartRecord(*record) for record
+                      in struct.iter_unpack('>HHHHH', fontfile.read(10*partcnt))]
+
+        fixed = [p for p in self.parts if not p.partFlags]
+        extenders = [p for p in self.parts if p.partFlags]
+        self._fixedcnt = len(fixed)
+        self._fixedadv = sum(p.fullAdvance for p in fixed)
+        self._extcnt = len(extenders)
+        self._extadv = sum(p.fullAdvance for p in extenders)
+        self._assemblecache = lru_cache(maxsize=256)(self._assemble)
+
+    @cached_property
+    def _partglyphs(self) -> list[GlyphType]:
+        ''' Glyph for each part, loaded on first assembly '''
+        return [self.font.glyph_fromid(part.glyphId) for part in self.parts]
+
+    def _size(self, num_extenders: int, minoverlap: float) -> float:
+        ''' Size of assembly using num_extenders of each extender part,
+            with minimum overlap between parts
+        '''
+        count = self._fixedcnt + num_extenders * self._extcnt
+        return (self._fixedadv + num_extenders * self._extadv
+                - (count - 1) * minoverlap)
 
     def assemble(self, reqsize: float, minoverlap: float) -> AssembledGlyph:
         ''' Build glyph assembly, combining parts to create any required size
@@ -476,52 +541,53 @@ class MathAssembly:
                 reqsize: Desired glyph size
                 minoverlap: Minimum overlap from variants table
         '''
-        size = 0.
-        num_extenders = 0
+        return self._assemblecache(reqsize, minoverlap)
 
+    def _assemble(self, reqsize: float, minoverlap: float) -> AssembledGlyph:
         # Determine number of extender parts needed.
-        while size < reqsize:
-            # Min overlap give largest size with this many extenders
-
-            testparts = []
-            for part in self.parts:
-                if part.partFlags:
-                    testparts.extend([part]*num_extenders)
-                else:
-                    testparts.append(part)
-
-            y = 0.
-            for i, part in enumerate(testparts):
-                if i > 0:
-                    y -= minoverlap
-                y += part.fullAdvance
-            size = y
-            num_extenders += 1
+        # Min overlap give largest size with this many extenders
+        growth = self._extadv - self._extcnt * minoverlap
+        if growth > 0:
+            num_extenders = max(0, ceil((reqsize - self._size(0, minoverlap)) / growth))
+            # Guard against float rounding in the division
+            while self._size(num_extenders, minoverlap) < reqsize:
+                num_extenders += 1
+            while num_extenders > 0 and self._size(num_extenders-1, minoverlap) >= reqsize:
+                num_extenders -= 1
+        else:
+            num_extenders = 0
+        size = self._size(num_extenders, minoverlap)
+
+        testparts = []
+        glyphs = []
+        for part, glyph in zip(self.parts, self._partglyphs):
+            if part.partFlags:
+                testparts.extend([part]*num_extenders)
+                glyphs.extend([glyph]*num_extenders)
+            else:
+                testparts.append(part)
+                glyphs.append(glyph)
 
         # Decrease overlap since full extenders make it too tall
         dy = (size - reqsize) / (len(testparts)-1)
 
+        vert = self.vert
+
         # Build transforms for compound glyph
         offsets = []
-        if self.vert:
-            y = -reqsize/2 + self.font.math.consts.axisHeight
-        else:
-            y = 0.
-        for i, part in enumerate(testparts):
+        overlap = minoverlap + dy
+        y = -reqsize/2 + self.font.consts.axisHeight if vert else 0.
+        for i, (part, glyph) in enumerate(zip(testparts, glyphs)):
             if i > 0:
-                y -= minoverlap + dy
-            if self.vert:
-                offsets.append(y - self.font.glyph_fromid(part.glyphId).bbox.ymin)
-            else:
-                offsets.append(y)
+                y -= overlap
+            offsets.append(y - glyph.bbox.ymin if vert else y)
             y += part.fullAdvance
 
-        # Put together the CompoundGlyph
-        glyphs = [self.font.glyph_fromid(part.glyphId) for part in testparts]
-
-        # Make a unique ID, negative so it can't clash with other glyphs
-        glyfid = -(testparts[0].glyphId + int(reqsize) << 16)
-        return AssembledGlyph(glyfid, glyphs, offsets, vert=self.vert, font=self.font)
+        # Make a unique ID, negative so it can't clash with other glyphs.
+        # Size goes in the upper 16 bits, base glyph id in the lower 16.
+        sizebits = (int(round(reqsize)) & 0xFFFF) << 16
+        glyfid = -(sizebits | (testparts[0].glyphId & 0xFFFF))
+        return AssembledGlyph(glyfid, glyphs, offsets, vert=vert, font=self.font)
 
 
 class MathVariants:
@@ -535,9 +601,14 @@ class MathVariants:
         self.minoverlap = minoverlap
         self.font = font
         self.vert = vert
+        self._variantcache = lru_cache(maxsize=1024)(self._getvariant)
+        self._minmaxcache = lru_cache(maxsize=1024)(self._getvariant_minmax)
 
     def getvariant(self, glyphid: int, size: float) -> GlyphType:
         ''' Get the proper size variant for the glyphid '''
+        return self._variantcache(glyphid, size)
+
+    def _getvariant(self, glyphid: int, size: float) -> GlyphType:
         glf: GlyphType
         covidx = self.coverage.covidx(glyphid)
         if covidx is None:
@@ -546,22 +617,24 @@ class MathVariants:
 
         construction = self.construction[covidx]
         variants = construction.variants
-        try:
-            variantid = variants[min(k for k in variants if k >= size)]
-
-        except ValueError:
+        sizes = construction.sizes
+        idx = bisect_left(sizes, size)
+        if idx == len(sizes):
             # size is bigger than all variants. Use assembly table.
             if construction.assembly:
                 glf = construction.assembly.assemble(size, self.minoverlap)
             else:
-                glf = self.font.glyph_fromid(variants[max(variants.keys())])
+                glf = self.font.glyph_fromid(variants[sizes[-1]])
         else:
-            glf = self.font.glyph_fromid(variantid)
+            glf = self.font.glyph_fromid(variants[sizes[idx]])
 
         return glf
 
     def getvariant_minmax(self, glyphid: int, ymin: float, ymax: float) -> GlyphType:
         ''' Get the smallest variant that encloses ymin and ymax '''
+        return self._minmaxcache(glyphid, ymin, ymax)
+
+    def _getvariant_minmax(self, glyphid: int, ymin: float, ymax: float) -> GlyphType:
         glf: GlyphType
         covidx = self.coverage.covidx(glyphid)
         if covidx is None:
@@ -591,32 +664,27 @@ class MathKernTable:
     ''' Math Kerning Table, for adjusting sub/superscripts
 
         Args:
-            ofst: Byte offset into font file
-            fontfile: font file
+            ofst: Byte offset into MATH table reader
+            fontfile: MATH table reader
     '''
     def __init__(self, ofst: int, fontfile: FontReader):
         fileptr = fontfile.tell()
         fontfile.seek(ofst)
         heightcnt = fontfile.readuint16()
-        self.heights = []
-        for i in range(heightcnt):
-            self.heights.append(read_valuerecord(fontfile))
-        self.kernvalues = []
-        for i in range(heightcnt+1):
-            self.kernvalues.append(read_valuerecord(fontfile))
+        self.heights = read_valuerecords(fontfile, heightcnt)
+        self.kernvalues = read_valuerecords(fontfile, heightcnt+1)
         fontfile.seek(fileptr)
 
     def getkern(self, height: float) -> int:
         ''' Get kerning for this height '''
-        if len(self.heights) == 0:
-            return self.kernvalues[0]
+        # Heights are sorted, kernvalues[i] applies below heights[i]
+        return self.kernvalues[bisect_right(self.heights, height)]
 
-        for i, h in enumerate(self.heights):
-            if h > height:
-                break
-        else:
-            i += 1
-        return self.kernvalues[i]
+    def getkern_pair(self, height1: float, height2: float) -> tuple[int, int]:
+        ''' Get kerning for two heights '''
+        heights, kernvalues = self.heights, self.kernvalues
+        return (kernvalues[bisect_right(heights, height1)],
+                kernvalues[bisect_right(heights, height2)])
 
 
 class ZeroKern:
@@ -625,44 +693,71 @@ class ZeroKern:
         ''' Get kerning for this height '''
         return 0
 
+    def getkern_pair(self, height1: float, height2: float) -> tuple[int, int]:
+        ''' Get kerning for two heights '''
+        return 0, 0
+
+
+_ZERO_KERN = ZeroKern()
+
 
 class MathKernInfoTable:
     ''' Math Kerning Info Table, listing of MathKernTables
 
+        Kern tables for each corner are stored in separate lists, indexed
+        by coverage index.
+
         Args:
-            ofst: Byte offset into font file
-            fontfile: Font File
+            ofst: Byte offset into MATH table reader
+            fontfile: MATH table reader
     '''
     def __init__(self, ofst: int, fontfile: FontReader, nulltable: bool = False):
-        if nulltable:
-            self.kerninfo = None
-            self.coverage = None
-        else:
+        self.tr: list[KernType] = []
+        self.tl: list[KernType] = []
+        self.br: list[KernType] = []
+        self.bl: list[KernType] = []
+        self.coverage: Optional[Coverage] = None
+        if not nulltable:
             fontfile.seek(ofst)
             covofst = fontfile.readuint16()
             cnt = fontfile.readuint16()
-            self.kerninfo = []
-            for i in range(cnt):
-                tr = fontfile.readuint16()
-                tl = fontfile.readuint16()
-                br = fontfile.readuint16()
-                bl = fontfile.readuint16()
-                self.kerninfo.append(MathKernInfoRecord(
-                    MathKernTable(tr+ofst, fontfile) if tr else ZeroKern(),
-                    MathKernTable(tl+ofst, fontfile) if tl else ZeroKern(),
-                    MathKernTable(br+ofst, fontfile) if br else ZeroKern(),
-                    MathKernTable(bl+ofst, fontfile) if bl else ZeroKern()))
-            self.coverage = Coverage(ofst+covofst, fontfile)
+            for tr, tl, br, bl in struct.iter_unpack('>HHHH', fontfile.read(8*cnt)):
+                self.tr.append(MathKernTable(tr+ofst, fontfile) if tr else _ZERO_KERN)
+                self.tl.append(MathKernTable(tl+ofst, fontfile) if tl else _ZERO_KERN)
+                self.br.append(MathKernTable(br+ofst, fontfile) if br else _ZERO_KERN)
+                self.bl.append(MathKernTable(bl+ofst, fontfile) if bl else _ZERO_KERN)
+            self.coverage = CachedCoverage(ofst+covofst, fontfile)
+
+    def _corner(self, tables: list[KernType], glyphid: int) -> KernType:
+        if self.coverage is None:
+            return _ZERO_KERN
+        idx = self.coverage.covidx(glyphid)
+        return tables[idx] if idx is not None else _ZERO_KERN
+
+    def topright(self, glyphid: int) -> KernType:
+        ''' Top-right kern table for the glyph '''
+        return self._corner(self.tr, glyphid)
+
+    def topleft(self, glyphid: int) -> KernType:
+        ''' Top-left kern table for the glyph '''
+        return self._corner(self.tl, glyphid)
+
+    def bottomright(self, glyphid: int) -> KernType:
+        ''' Bottom-right kern table for the glyph '''
+        return self._corner(self.br, glyphid)
+
+    def bottomleft(self, glyphid: int) -> KernType:
+        ''' Bottom-left kern table for the glyph '''
+        return self._corner(self.bl, glyphid)
 
     def glyph(self, glyphid: int) -> Optional[MathKernInfoRecord]:
         ''' Get kerning info record for this glyph '''
         if self.coverage is None:
             return None
-
         idx = self.coverage.covidx(glyphid)
-        if idx is not None:
-            return self.kerninfo[idx]
-        return None
+        if idx is None:
+            return None
+        return MathKernInfoRecord(self.tr[idx], self.tl[idx], self.br[idx], self.bl[idx])
 
 
 class MathSubTable:
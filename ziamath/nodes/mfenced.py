@@ -1,12 +1,12 @@
 ''' <mfenced> math element '''
 from typing import Union
-from itertools import chain, zip_longest
+from copy import deepcopy
 import xml.etree.ElementTree as ET
 
 from ziafont.fonttypes import BBox
 
 from .. import operators
-from ..drawable import Glyph
+from ..drawable import glyphnode
 from .mnode import Mnode
 from .msubsup import Msub, Msup, Msubsup
 from .mfrac import Mfrac
@@ -16,6 +16,8 @@ class Mfenced(Mnode, tag='mfenced'):
     ''' Mfence element. Puts contents in parenthesis or other fence glyphs, with
         optional separators between components.
     '''
+    __slots__ = ('openchr', 'closechr', 'separators')
+
     def __init__(self, element: ET.Element, parent: 'Mnode', **kwargs):
         super().__init__(element, parent, **kwargs)
         self.openchr = element.get('open', '(')
@@ -24,13 +26,15 @@ class Mfenced(Mnode, tag='mfenced'):
         self._setup(**kwargs)
 
     def _setup(self, **kwargs) -> None:
-        separator_elms = [ET.fromstring(f'<mo>{k}</mo>') for k in self.separators]
         fencedelms: Union[list[ET.Element], ET.Element] = []
         # Insert separators
         if len(self.element) > 1 and len(self.separators) > 0:
-            fencedelms = list(chain.from_iterable(zip_longest(
-                    self.element, separator_elms, fillvalue=separator_elms[-1])))   # flatten
-            fencedelms = fencedelms[:len(self.element)*2-1]  # Remove any separators at end
+            separator_elms = [ET.fromstring(f'<mo>{k}</mo>') for k in self.separators]
+            lastsep = separator_elms[-1]  # Repeated if more children than separators
+            fencedelms = [self.element[0]]
+            for i, child in enumerate(self.element[1:]):
+                fencedelms.append(separator_elms[i] if i < len(separator_elms) else lastsep)
+                fencedelms.append(child)
         else:
             # Single element in fence, no separators
             fencedelms = self.element
@@ -40,11 +44,12 @@ class Mfenced(Mnode, tag='mfenced'):
 
         # Make a copy of mrowelm because it can get modified
         # and we need the original later
-        mrow = Mnode.fromelement(ET.fromstring(ET.tostring(mrowelm)), parent=self)
+        mrow = Mnode.fromelement(deepcopy(mrowelm), parent=self)
         # standard size fence glyph
         openglyph = self.font.glyph(self.openchr)
-        mglyph = Glyph(
-            openglyph, self.openchr, self.glyphsize, self.style, **kwargs)
+        phantom = kwargs.get('phantom', False)
+        mglyph = glyphnode(
+            openglyph, self.openchr, self.glyphsize, self.style, phantom)
         if len(mrow.nodes) == 0:
             # Opening fence with nothing in it
             fencebbox = mglyph.bbox
@@ -54,22 +59,26 @@ class Mfenced(Mnode, tag='mfenced'):
             openglyph = self.font.math.variant_minmax(openglyph.index,
                                                       self.points_to_units(mrow.bbox.ymin),
                                                       self.points_to_units(mrow.bbox.ymax))
-            oglyph = Glyph(openglyph, self.openchr, self.glyphsize,
-                           self.style, **kwargs)
+            oglyph = glyphnode(openglyph, self.openchr, self.glyphsize,
+                               self.style, phantom)
 
             if self.closechr:
                 closeglyph = self.font.glyph(self.closechr)
                 closeglyph = self.font.math.variant_minmax(closeglyph.index,
                                                            self.points_to_units(mrow.bbox.ymin),
                                                            self.points_to_units(mrow.bbox.ymax))
-                cglyph = Glyph(closeglyph, self.closechr, self.glyphsize,
-                               self.style, **kwargs)
+                cglyph = glyphnode(closeglyph, self.closechr, self.glyphsize,
+                                   self.style, phantom)
 
             # Rebuild the mrow with the height parameter to get stretchy
-            # \middle fences
-            mrowelm = ET.Element('mrow')
-            mrowelm.extend(fencedelms)
-            mrow = Mnode.fromelement(mrowelm, parent=self, height=oglyph.bbox.ymax-oglyph.bbox.ymin)
+            # \middle fences. Height only affects stretchy operators
+            # directly in the row, so skip the rebuild without them.
+            if any(node.mtag == 'mo' and node.params.get('stretchy', 'false') != 'false'
+                   for node in mrow.nodes):
+                mrowelm = ET.Element('mrow')
+                mrowelm.extend(fencedelms)
+                mrow = Mnode.fromelement(mrowelm, parent=self,
+                                         height=oglyph.bbox.ymax-oglyph.bbox.ymin)
             fencebbox = mrow.bbox
             xadvance = mrow.xadvance()
 
@@ -101,7 +110,7 @@ class Mfenced(Mnode, tag='mfenced'):
             try:
                 # Mfrac, Msub adds space to right, remove it for fence
                 if isinstance(mrow.nodes[-1], (Msub, Msup, Msubsup)):
-                    x -= self.units_to_points(self.font.math.consts.spaceAfterScript)
+                    x -= self.units_to_points(self.font.consts.spaceAfterScript)
                 elif isinstance(mrow.nodes[-1], Mfrac):
                     x -= self.size_px('verythinmathspace')
             except (IndexError, AttributeError):
@@ -3,25 +3,30 @@ from xml.etree import ElementTree as ET
 
 from ziafont.fonttypes import BBox
 
-from ..styles import parse_style
 from ..drawable import HLine
 from . import Mnode
 
 
 class Mfrac(Mnode, tag='mfrac'):
     ''' Fraction node '''
+    __slots__ = ('numerator', 'denominator')
+
     # TODO: bevelled attribute for x/y fractions with slanty bar
     def __init__(self, element: ET.Element, parent: 'Mnode', **kwargs):
-        pre_style = parse_style(element, parent.style)
-
         # check original mml attribute for displaystyle to see if
-        # it was explicitly turned on (eg dfrac) and not inherited
-        if (element.attrib.get('displaystyle') != 'true'
+        # it was explicitly turned on (eg dfrac) and not inherited.
+        # Only displaystyle and scriptlevel are needed here, so read them
+        # directly rather than parsing the full style twice.
+        attrib = element.attrib
+        displaystyle = attrib.get('displaystyle')
+        if (displaystyle != 'true'
             and ('sup' in kwargs
                  or 'sub' in kwargs
                  or 'frac' in kwargs
-                 or not pre_style.displaystyle)):
-            element.set('scriptlevel', str(pre_style.scriptlevel + 1))
+                 or displaystyle is not None  # Explicitly not 'true'
+                 or not parent.style.displaystyle)):
+            scriptlevel = int(attrib.get('scriptlevel', parent.style.scriptlevel))
+            element.set('scriptlevel', str(scriptlevel + 1))
 
         # super() after determining scriptlevel so that scale factors are calculated
         super().__init__(element, parent, **kwargs)
@@ -33,8 +38,9 @@ class Mfrac(Mnode, tag='mfrac'):
         self._setup(**kwargs)
 
     def _setup(self, **kwargs) -> None:
-
-        linethick = self.units_to_points(self.font.math.consts.fractionRuleThickness)
+        consts = self.font.consts
+        u2p = self._glyph_pts_per_unit
+        linethick = consts.fractionRuleThickness * u2p
         if 'linethickness' in self.element.attrib:
             lt = self.element.get('linethickness', '')
             try:
@@ -44,41 +50,34 @@ class Mfrac(Mnode, tag='mfrac'):
                              'thick': linethick * 2}.get(lt, linethick)
 
         if self.style.displaystyle:
-            ynum = self.units_to_points(
-                -self.font.math.consts.fractionNumeratorDisplayStyleShiftUp)
-            ydenom = self.units_to_points(
-                self.font.math.consts.fractionDenominatorDisplayStyleShiftDown)
-            numgap = self.units_to_points(
-                self.font.math.consts.fractionNumDisplayStyleGapMin)
-            denomgap = self.units_to_points(
-                self.font.math.consts.fractionDenomDisplayStyleGapMin)
+            ynum = -consts.fractionNumeratorDisplayStyleShiftUp * u2p
+            ydenom = consts.fractionDenominatorDisplayStyleShiftDown * u2p
+            numgap = consts.fractionNumDisplayStyleGapMin * u2p
+            denomgap = consts.fractionDenomDisplayStyleGapMin * u2p
         else:
-            ynum = self.units_to_points(
-                -self.font.math.consts.fractionNumeratorShiftUp)
-            ydenom = self.units_to_points(
-                self.font.math.consts.fractionDenominatorShiftDown)
-            numgap = self.units_to_points(
-                self.font.math.consts.fractionNumeratorGapMin)
-            denomgap = self.units_to_points(
-                self.font.math.consts.fractionDenominatorGapMin)
+            ynum = -consts.fractionNumeratorShiftUp * u2p
+            ydenom = consts.fractionDenominatorShiftDown * u2p
+            numgap = consts.fractionNumeratorGapMin * u2p
+            denomgap = consts.fractionDenominatorGapMin * u2p
 
         denombox = self.denominator.bbox
         numbox = self.numerator.bbox
         if self.parent.mtag == 'mrow':
             # Make sure axisheight aligns across mrow even with different font sizes
-            axheight = self.parent.units_to_points(self.font.math.consts.axisHeight)
+            axheight = self.parent.units_to_points(consts.axisHeight)
         else:
-            axheight = self.units_to_points(self.font.math.consts.axisHeight)
+            axheight = consts.axisHeight * u2p
 
         ynum = min(ynum, -(axheight + numgap - numbox.ymin + linethick/2))
         ydenom = max(ydenom, (-axheight + denomgap + denombox.ymax + linethick/2))
 
         x = 0.
+        thinspace = self.size_px('thinmathspace')
         if (leftsibling := self.leftsibling()):
             if leftsibling.mtag == 'mfrac':
                 x = self.size_px('verythinmathspace')
             else:
-                x = self.size_px('thinmathspace')
+                x = thinspace
 
         width = max(numbox.xmax, denombox.xmax)
         xnum = x + (width - (numbox.xmax - numbox.xmin))/2
@@ -95,7 +94,7 @@ class Mfrac(Mnode, tag='mfrac'):
         # Calculate/cache bounding box
         xmin = 0
         xmax = x + max(numbox.xmax, denombox.xmax)
-        xmax += self.size_px('thinmathspace')
+        xmax += thinspace
         ymin = (-ydenom) + denombox.ymin
         ymax = (-ynum) + numbox.ymax
         self.bbox = BBox(xmin, xmax, ymin, ymax)
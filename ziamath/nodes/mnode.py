@@ -2,6 +2,7 @@
 from __future__ import annotations
 from typing import Optional, MutableMapping, Type
 import logging
+from functools import lru_cache
 from xml.etree import ElementTree as ET
 
 from ziafont.fonttypes import BBox
@@ -11,11 +12,47 @@ from ..mathfont import MathFont
 from ..drawable import Drawable
 from ..styles import MathStyle, parse_style
 from ..config import config
-from .. import operators
-from .nodetools import elementtext, infer_opform
+from .nodetools import infer_opform, retag_operator
 
 _node_classes: dict[str, Type['Mnode']] = {}
 
+# Elements drawn using another element's node class
+_TAG_ALIASES = {'math': 'mrow', 'mtd': 'mrow', 'mtr': 'mrow', 'ms': 'mtext'}
+
+_NAMED_SPACES = {
+    "veryverythinmathspace": f'{1/18}em',
+    "verythinmathspace": f'{2/18}em',
+    "thinmathspace": f'{3/18}em',
+    "mediummathspace": f'{4/18}em',
+    "thickmathspace": f'{5/18}em',
+    "verythickmathspace": f'{6/18}em',
+    "veryverythickmathspace": f'{7/18}em',
+    "negativeveryverythinmathspace": f'{-1/18}em',
+    "negativeverythinmathspace": f'{-2/18}em',
+    "negativethinmathspace": f'{-3/18}em',
+    "negativemediummathspace": f'{-4/18}em',
+    "negativethickmathspace": f'{-5/18}em',
+    "negativeverythickmathspace": f'{-6/18}em',
+    "negativeveryverythickmathspace": f'{-7/18}em',
+    }
+
+
+@lru_cache(maxsize=256)
+def _parse_size(size: str) -> tuple[float, bool]:
+    ''' Parse a size attribute into its value and whether the value is
+        in ems (to be scaled by font size). pt values are converted to px.
+    '''
+    numsize = _NAMED_SPACES.get(size, size)
+    numsize = numsize.rstrip('px')
+    try:
+        return float(numsize), False
+    except ValueError:
+        if numsize.endswith('em'):
+            return float(numsize[:-2]), True
+        elif numsize.endswith('pt'):
+            return float(numsize[:-2]) * 1.333, False  # 1.333 points to pixels
+    return 0., False
+
 
 class Mnode(Drawable):
     ''' Math Drawing Node
@@ -25,6 +62,8 @@ class Mnode(Drawable):
             size: base font size in points
             parent: Mnode of parent
     '''
+    __slots__ = ('element', 'font', 'parent', 'size', 'style', 'params', 'nodes', 'nodexy',
+                 'glyphsize', '_font_pts_per_unit', '_glyph_pts_per_unit')
     mtag = 'mnode'
 
     def __init__(self, element: ET.Element, parent: 'Mnode', **kwargs):
@@ -37,14 +76,15 @@ class Mnode(Drawable):
         self.params: MutableMapping[str, str] = {}
         self.nodes: list[Drawable] = []
         self.nodexy: list[tuple[float, float]] = []
+        font = self.font
         self.glyphsize = max(
-            self.size * (self.font.math.consts.scriptPercentScaleDown/100)**self.style.scriptlevel,
-            self.font.basesize*config.minsizefraction)
+            self.size * (font.consts.scriptPercentScaleDown/100)**self.style.scriptlevel,
+            font.basesize*config.minsizefraction)
         if self.style.mathsize:
             self.glyphsize = self.size_px(self.style.mathsize)
 
-        self._font_pts_per_unit = self.size / self.font.info.layout.unitsperem
-        self._glyph_pts_per_unit = self.glyphsize / self.font.info.layout.unitsperem
+        self._font_pts_per_unit = self.size / font.unitsperem
+        self._glyph_pts_per_unit = self.glyphsize / font.unitsperem
         self.bbox = BBox(0, 0, 0, 0)
 
     def __init_subclass__(cls, tag: str) -> None:
@@ -55,18 +95,17 @@ class Mnode(Drawable):
     @classmethod
     def fromelement(cls, element: ET.Element, parent: 'Mnode', **kwargs) -> 'Mnode':
         ''' Construct a new node from the element and its parent '''
-        if element.tag in ['math', 'mtd', 'mtr']:
-            element.tag = 'mrow'
-        elif element.tag == 'ms':
-            element.tag = 'mtext'
-        elif element.tag == 'mi' and elementtext(element) in operators.names:
-            # Workaround for some latex2mathml operators coming back as identifiers
-            element.tag = 'mo'
-
-        if element.tag == 'mo':
+        tag = element.tag
+        if tag in _TAG_ALIASES:
+            tag = element.tag = _TAG_ALIASES[tag]
+        elif tag == 'mi':
+            retag_operator(element)
+            tag = element.tag
+
+        if tag == 'mo':
             infer_opform(0, element, parent)
 
-        node = _node_classes.get(element.tag, None)
+        node = _node_classes.get(tag, None)
         if node:
             return node(element, parent, **kwargs)
 
@@ -129,36 +168,20 @@ class Mnode(Drawable):
 
     def size_px(self, size: str, fontsize: float = None) -> float:
         ''' Get size in points from the attribute string '''
-        if fontsize is None:
-            fontsize = self.glyphsize
-
-        numsize = {"veryverythinmathspace": f'{1/18}em',
-                   "verythinmathspace": f'{2/18}em',
-                   "thinmathspace": f'{3/18}em',
-                   "mediummathspace": f'{4/18}em',
-                   "thickmathspace": f'{5/18}em',
-                   "verythickmathspace": f'{6/18}em',
-                   "veryverythickmathspace": f'{7/18}em',
-                   "negativeveryverythinmathspace": f'{-1/18}em',
-                   "negativeverythinmathspace": f'{-2/18}em',
-                   "negativethinmathspace": f'{-3/18}em',
-                   "negativemediummathspace": f'{-4/18}em',
-                   "negativethickmathspace": f'{-5/18}em',
-                   "negativeverythickmathspace": f'{-6/18}em',
-                   "negativeveryverythickmathspace": f'{-7/18}em',
-                   }.get(size, size)
-
-        numsize = numsize.rstrip('px')
-        try:
-            pxsize = float(numsize)
-        except ValueError as exc:
-            if numsize.endswith('em'):
-                pxsize = float(numsize[:-2]) * fontsize
-            elif numsize.endswith('pt'):
-                pxsize = float(numsize[:-2]) * 1.333  # 1.333 points to pixels
-            else:
-                pxsize = 0
-        return pxsize
+        value, isem = _parse_size(size)
+        if isem:
+            if fontsize is None:
+                fontsize = self.glyphsize
+            return value * fontsize
+        return value
+
+    def _bboxrect(self, x: float, y: float) -> dict[str, str]:
+        ''' SVG rect attributes covering the bbox with node at x, y '''
+        bbox = self.bbox
+        return {'x': fmt(x + bbox.xmin),
+                'y': fmt(y - bbox.ymax),
+                'width': fmt(bbox.xmax - bbox.xmin),
+                'height': fmt(bbox.ymax - bbox.ymin)}
 
     def draw(self, x: float, y: float, svg: ET.Element) -> tuple[float, float]:
         ''' Draw the node on the SVG
@@ -168,27 +191,25 @@ class Mnode(Drawable):
                 y: Vertical position in SVG coordinates
                 svg: SVG drawing as XML
         '''
-        if config.debug.bbox:
-            rect = ET.SubElement(svg, 'rect')
-            rect.set('x', fmt(x + self.bbox.xmin))
-            rect.set('y', fmt(y - self.bbox.ymax))
-            rect.set('width', fmt((self.bbox.xmax - self.bbox.xmin)))
-            rect.set('height', fmt((self.bbox.ymax - self.bbox.ymin)))
-            rect.set('fill', 'none')
-            rect.set('stroke', 'blue')
-            rect.set('stroke-width', '0.2')
-        if config.debug.baseline:
-            base = ET.SubElement(svg, 'path')
-            base.set('d', f'M {x} 0 L {x+self.bbox.xmax} 0')
-            base.set('stroke', 'red')
-
-        if self.style.mathbackground not in ['none', None]:
-            rect = ET.SubElement(svg, 'rect')
-            rect.set('x', fmt(x + self.bbox.xmin))
-            rect.set('y', fmt(y - self.bbox.ymax))
-            rect.set('width', fmt((self.bbox.xmax - self.bbox.xmin)))
-            rect.set('height', fmt((self.bbox.ymax - self.bbox.ymin)))
-            rect.set('fill', str(self.style.mathbackground))
+        rect = None
+        debug = config.debug
+        if debug.bbox:
+            rect = self._bboxrect(x, y)
+            ET.SubElement(svg, 'rect', {
+                **rect,
+                'fill': 'none',
+                'stroke': 'blue',
+                'stroke-width': '0.2'})
+        if debug.baseline:
+            ET.SubElement(svg, 'path', {
+                'd': f'M {fmt(x)} 0 L {fmt(x+self.bbox.xmax)} 0',
+                'stroke': 'red'})
+
+        background = self.style.mathbackground
+        if background is not None and background != 'none':
+            ET.SubElement(svg, 'rect', {
+                **(rect or self._bboxrect(x, y)),
+                'fill': str(background)})
 
         nodex = nodey = 0.
         for (nodex, nodey), node in zip(self.nodexy, self.nodes):
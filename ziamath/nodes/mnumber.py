@@ -4,13 +4,15 @@ import xml.etree.ElementTree as ET
 from ziafont.fonttypes import BBox
 
 from ..styles import styledstr, auto_italic
-from ..drawable import Glyph
+from ..drawable import glyphnode
 from .nodetools import subglyph, elementtext
 from .mnode import Mnode
 
 
 class Mnumber(Mnode, tag='mn'):
     ''' Mnumber node <mn> '''
+    __slots__ = ('string',)
+
     def __init__(self, element: ET.Element, parent: 'Mnode', **kwargs):
         super().__init__(element, parent, **kwargs)
         self.string = self._getstring()
@@ -22,36 +24,40 @@ class Mnumber(Mnode, tag='mn'):
         return styledstr(text, self.style.mathvariant)
 
     def _setup(self, **kwargs) -> None:
-        ymin = 9999.
-        ymax = -9999.
         x = 0.
 
         if (leftsibling := self.leftsibling()) and leftsibling.mtag == 'mfenced':
             x = self.size_px('verythinmathspace')
 
-        for i, char in enumerate(self.string):
-            glyph = self.font.glyph(char)
-            if kwargs.get('sup') or kwargs.get('sub'):
-                glyph = subglyph(glyph, self.font)
+        glyphs = [self.font.glyph(char) for char in self.string]
+        nextglyphs = glyphs[1:] + [None]
+        if kwargs.get('sup') or kwargs.get('sub'):
+            glyphs = [subglyph(glyph, self.font) for glyph in glyphs]
 
-            self.nodes.append(
-                Glyph(glyph, char, self.glyphsize, self.style, **kwargs))
+        pts_per_unit = self._glyph_pts_per_unit
+        for glyph, nextglyph, char in zip(glyphs, nextglyphs, self.string):
+            node = glyphnode(glyph, char, self.glyphsize, self.style,
+                             kwargs.get('phantom', False))
+            self.nodes.append(node)
 
-            if self.nodes[-1].bbox.xmin < 0:
+            if node.bbox.xmin < 0:
                 # don't let glyphs run together if xmin < 0
-                x -= self.nodes[-1].bbox.xmin
-            
+                x -= node.bbox.xmin
 
             self.nodexy.append((x, 0))
-            nextglyph = self.font.glyph(self.string[i+1]) if i < len(self.string)-1 else None
-            x += self.units_to_points(glyph.advance(nextchr=nextglyph))
-            ymin = min(ymin, self.units_to_points(glyph.path.bbox.ymin))
-            ymax = max(ymax, self.units_to_points(glyph.path.bbox.ymax))
+            x += glyph.advance(nextchr=nextglyph) * pts_per_unit
+
+        ymin, ymax = 9999., -9999.
+        if glyphs:
+            # Scale once after finding extremes in font units
+            bboxes = [glyph.path.bbox for glyph in glyphs]
+            ymin = min(b.ymin for b in bboxes) * pts_per_unit
+            ymax = max(b.ymax for b in bboxes) * pts_per_unit
 
         try:
             xmin = self.nodes[0].bbox.xmin
             xmax = self.nodexy[-1][0] + max(self.nodes[-1].bbox.xmax,
-                                            self.units_to_points(glyph.advance()))
+                                            glyphs[-1].advance() * pts_per_unit)
         except IndexError:
             xmin = 0.
             xmax = x
@@ -60,6 +66,8 @@ class Mnumber(Mnode, tag='mn'):
 
 class Midentifier(Mnumber, tag='mi'):
     ''' Number node <mn> '''
+    __slots__ = ()
+
     def _getstring(self) -> str:
         ''' Get the styled string for the identifier. Applies
             italics if single-char identifier, and extra whitespace
@@ -82,6 +90,8 @@ class Midentifier(Mnumber, tag='mi'):
 
 class Mtext(Mnumber, tag='mtext'):
     ''' Text Node <mtext> '''
+    __slots__ = ()
+
     def _getstring(self) -> str:
         string = ''
         if self.element.text:
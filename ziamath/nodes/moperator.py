@@ -1,17 +1,25 @@
 ''' <mo> Math Operator Element '''
+from __future__ import annotations
+from typing import Optional
+from functools import lru_cache
 import xml.etree.ElementTree as ET
 
 from ziafont.fonttypes import BBox
+from ziafont.glyph import SimpleGlyph
+
+from ..mathfont import MathFont
 
 from ..styles import styledstr
-from ..drawable import Glyph
+from ..drawable import glyphnode
 from .. import operators
 from . import Mnode
-from .nodetools import elementtext, subglyph
+from .nodetools import elementtext, subglyph, gsub_state
 
 
 class Moperator(Mnode, tag='mo'):
     ''' Operator math element '''
+    __slots__ = ('string', 'form', 'width', 'height')
+
     def __init__(self, element: ET.Element, parent: 'Mnode', **kwargs):
         super().__init__(element, parent, **kwargs)
         self.string = styledstr(elementtext(self.element), self.style.mathvariant)
@@ -47,51 +55,87 @@ class Moperator(Mnode, tag='mo'):
         self._setup(**kwargs)
 
     def _setup(self, **kwargs):
-        glyphs = [self.font.glyph(char) for char in self.string]
-
-        if kwargs.get('sup') or kwargs.get('sub'):
-            addspace = False  # Dont add lspace/rspace when in super/subscripts
-            glyphs = [subglyph(g, self.font) for g in glyphs]
+        script = bool(kwargs.get('sup') or kwargs.get('sub'))
+        if script:
+            lspace = rspace = 0.  # Dont add lspace/rspace when in super/subscripts
         else:
-            addspace = True
+            lspace = self.size_px(self.params.get('lspace', '0'))
+            rspace = self.size_px(self.params.get('rspace', '0'))
+        largeop = self.params.get('largeop') == 'true' and self.style.displaystyle
+        stretchy = self.params.get('stretchy', 'false') != 'false'
 
-        x = xmax = 0
-        self.nodes = []
+        glyphs, xs, self.bbox = _layout_operator(
+            self.font, self.string, self.glyphsize, script, lspace, rspace,
+            largeop, self.width, self.height if stretchy else None,
+            gsub_state(self.font) if script else ())
 
-        # Add lspace
-        if addspace:
-            x += self.size_px(self.params.get('lspace', '0'))
-
-        ymin = 999
-        ymax = -999
-        for glyph, char in zip(glyphs, self.string):
-            if self.params.get('largeop') == 'true' and self.style.displaystyle:
-                minh = self.font.math.consts.displayOperatorMinHeight
-                glyph = self.font.math.variant(glyph.index, minh, vert=True)
-
-            if self.width:
-                glyph = self.font.math.variant(
-                    glyph.index, self.points_to_units(self.width), vert=False)
-            elif (self.height
-                    and self.params.get('stretchy', 'false') != 'false'):
-                glyph = self.font.math.variant(
-                    glyph.index, self.points_to_units(self.height), vert=True)
-
-            self.nodes.append(Glyph(
-                glyph, char, self.glyphsize, self.style, **kwargs))
+        self.nodes = []
+        phantom = kwargs.get('phantom', False)
+        for glyph, char, x in zip(glyphs, self.string, xs):
+            self.nodes.append(glyphnode(
+                glyph, char, self.glyphsize, self.style, phantom))
             self.nodexy.append((x, 0))
-            xmax = max(xmax, x + self.units_to_points(glyph.path.bbox.xmax))
-            x += self.units_to_points(glyph.advance())
-            ymin = min(ymin, self.units_to_points(glyph.path.bbox.ymin))
-            ymax = max(ymax, self.units_to_points(glyph.path.bbox.ymax))
-
-        if addspace:
-            x += self.size_px(self.params.get('rspace', '0'))
-            xmax = max(xmax, x)
-
-        try:
-            xmin = self.units_to_points(glyphs[0].path.bbox.xmin)
-        except IndexError:
-            xmin = 0
-        
-        self.bbox = BBox(xmin, xmax, ymin, ymax)
+
+
+@lru_cache(maxsize=2048)
+def _layout_operator(font: MathFont, string: str, glyphsize: float, script: bool,
+                     lspace: float, rspace: float, largeop: bool,
+                     width: Optional[float], height: Optional[float],
+                     substate: tuple = ()
+                     ) -> tuple[tuple[SimpleGlyph, ...], tuple[float, ...], BBox]:
+    ''' Select glyphs for an operator string and lay them out.
+        Operators repeat often, so the result is cached. substate is
+        the font's gsub_state() when script glyphs are substituted,
+        used only to key the cache.
+
+        Returns:
+            glyphs: Glyph for each character
+            xs: x position of each glyph
+            bbox: Bounding box of the operator
+    '''
+    pts_per_unit = glyphsize / font.unitsperem
+    glyphs = [font.glyph(char) for char in string]
+
+    if script:
+        glyphs = [subglyph(g, font) for g in glyphs]
+
+    x = xmax = 0
+    xs = []
+    placed = []
+
+    # Add lspace
+    if not script:
+        x += lspace
+
+    ymin = 999
+    ymax = -999
+    for glyph in glyphs:
+        if largeop:
+            minh = font.consts.displayOperatorMinHeight
+            glyph = font.math.variant(glyph.index, minh, vert=True)
+
+        if width:
+            glyph = font.math.variant(
+                glyph.index, width / pts_per_unit, vert=False)
+        elif height:
+            glyph = font.math.variant(
+                glyph.index, height / pts_per_unit, vert=True)
+
+        placed.append(glyph)
+        xs.append(x)
+        xmax = max(xmax, x + glyph.path.bbox.xmax * pts_per_unit)
+        x += glyph.advance() * pts_per_unit
+        ymin = min(ymin, glyph.path.bbox.ymin * pts_per_unit)
+        ymax = max(ymax, glyph.path.bbox.ymax * pts_per_unit)
+
+    if not script:
+        x += rspace
+        xmax = max(xmax, x)
+
+    try:
+        # Note: xmin is taken from the unstretched glyph
+        xmin = glyphs[0].path.bbox.xmin * pts_per_unit
+    except IndexError:
+        xmin = 0
+
+    return tuple(placed), tuple(xs), BBox(xmin, xmax, ymin, ymax)
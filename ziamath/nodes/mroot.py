@@ -5,12 +5,14 @@ import xml.etree.ElementTree as ET
 
 from ziafont.fonttypes import BBox
 
-from ..drawable import Glyph, HLine
+from ..drawable import HLine, glyphnode
 from . import Mnode
 
 
 class Mroot(Mnode, tag='mroot'):
     ''' Nth root '''
+    __slots__ = ('base', 'degree')
+
     def __init__(self, element: ET.Element, parent: 'Mnode', **kwargs):
         super().__init__(element, parent, **kwargs)
         self.base, self.degree = self._getbase(**kwargs)
@@ -24,40 +26,46 @@ class Mroot(Mnode, tag='mroot'):
         return base, degree
 
     def _setup(self, **kwargs) -> None:
+        consts = self.font.consts
+        u2p = self._glyph_pts_per_unit
         height = self.base.bbox.ymax - self.base.bbox.ymin
 
         # Get the right root glyph to fit the contents
         rglyph = self.font.math.variant(self.font.glyphindex('√'),
                                         self.points_to_units(height))
-        rootnode = Glyph(rglyph, '√', self.glyphsize, self.style, **kwargs)
+        rootnode = glyphnode(rglyph, '√', self.glyphsize, self.style,
+                             kwargs.get('phantom', False))
 
         if self.style.displaystyle:
-            verticalgap = self.units_to_points(self.font.math.consts.radicalDisplayStyleVerticalGap)
+            verticalgap = consts.radicalDisplayStyleVerticalGap * u2p
         else:
-            verticalgap = self.units_to_points(self.font.math.consts.radicalVerticalGap)
+            verticalgap = consts.radicalVerticalGap * u2p
+
+        radbox = rglyph.path.bbox
+        radtop = radbox.ymax * u2p
 
         # Shift radical up/down to ensure minimum and consistent gap between top of text and overbar
-        if (self.base.bbox.ymax > self.units_to_points(rglyph.bbox.ymax) - verticalgap
-                or self.base.bbox.ymin <= self.units_to_points(rglyph.bbox.ymin + self.font.math.consts.radicalRuleThickness)):
+        if (self.base.bbox.ymax > rglyph.bbox.ymax * u2p - verticalgap
+                or self.base.bbox.ymin <= (rglyph.bbox.ymin + consts.radicalRuleThickness) * u2p):
             rtop = (self.base.bbox.ymax + verticalgap +
-                    self.units_to_points(self.font.math.consts.radicalRuleThickness))
-            yrad = -(rtop - self.units_to_points(rglyph.path.bbox.ymax))
-            ytop = yrad - self.units_to_points(rglyph.path.bbox.ymax)
+                    consts.radicalRuleThickness * u2p)
+            yrad = -(rtop - radtop)
+            ytop = yrad - radtop
         else:
             yrad = 0
-            ytop = -self.units_to_points(rglyph.path.bbox.ymax)
+            ytop = -radtop
 
         # If the root has a degree, draw it next as it
         # determines radical x position
         self.nodes = []
         x = 0.
         if self.degree:
-            x += self.units_to_points(self.font.math.consts.radicalKernBeforeDegree)
-            ydeg = ytop * self.font.math.consts.radicalDegreeBottomRaisePercent/100
+            x += consts.radicalKernBeforeDegree * u2p
+            ydeg = ytop * consts.radicalDegreeBottomRaisePercent/100
             self.nodes.append(self.degree)
             self.nodexy.append((x, ydeg))
             x += self.degree.xadvance()
-            x += self.units_to_points(self.font.math.consts.radicalKernAfterDegree)
+            x += consts.radicalKernAfterDegree * u2p
 
         self.nodes.append(rootnode)
         self.nodexy.append((x, yrad))
@@ -68,31 +76,33 @@ class Mroot(Mnode, tag='mroot'):
 
         if (lastg := self.base.lastglyph()):
             if (italicx := self.font.math.italicsCorrection.getvalue(lastg.index)):
-                width += self.units_to_points(italicx)
+                width += italicx * u2p
 
         self.nodes.append(HLine(
-            width, self.units_to_points(self.font.math.consts.radicalRuleThickness),
+            width, consts.radicalRuleThickness * u2p,
             style=self.style, **kwargs))
-        self.nodexy.append((x, yrad - self.units_to_points(rglyph.path.bbox.ymax)))
-        xmin = self.units_to_points(rglyph.path.bbox.xmin)
+        self.nodexy.append((x, yrad - radtop))
+        xmin = radbox.xmin * u2p
         xmax = x + width
-        ymin = min(-yrad + self.units_to_points(rglyph.path.bbox.ymin),
+        ymin = min(-yrad + radbox.ymin * u2p,
                    self.base.bbox.ymin)
         if self.degree:
-            ymax = max(-yrad + self.units_to_points(rglyph.path.bbox.ymax),
+            ymax = max(-yrad + radtop,
                        -ydeg+self.degree.bbox.ymax)
         else:
-            ymax = -yrad + self.units_to_points(rglyph.path.bbox.ymax)
+            ymax = -yrad + radtop
         self.bbox = BBox(xmin, xmax, ymin, ymax)
 
 
 class Msqrt(Mroot, tag='msqrt'):
     ''' Square root '''
+    __slots__ = ()
+
     def _getbase(self, **kwargs) -> tuple[Mnode, Optional[Mnode]]:
         ''' Get base and optional degree nodes for the root '''
         if len(self.element) > 1:
             row = ET.Element('mrow')
-            row.extend(list(self.element))
+            row.extend(self.element)
             base = Mnode.fromelement(row, parent=self, **kwargs)
         else:
             base = Mnode.fromelement(self.element[0], parent=self, **kwargs)
@@ -1,33 +1,45 @@
 ''' <mrow> Math Elelment '''
 from __future__ import annotations
-from typing import Optional, Union
-from copy import copy
+from typing import Optional
+from math import inf
+from bisect import bisect
 from xml.etree import ElementTree as ET
 
 from ziafont.fonttypes import BBox
 from ziafont.glyph import SimpleGlyph, fmt
 
-from ..drawable import Drawable
 from .. import operators
-from .nodetools import infer_opform, elementtext
+from .nodetools import infer_opform, elementtext, retag_operator
 from .mnode import Mnode
 
 
 class Mrow(Mnode, tag='mrow'):
     ''' Math row, list of vertically aligned Mnodes '''
+    __slots__ = ()
+
     def __init__(self, element: ET.Element, parent: 'Mnode', **kwargs):
         super().__init__(element, parent, **kwargs)
         self._setup(**kwargs)
 
+    @classmethod
+    def _from_line(cls, line: list[ET.Element], parent: 'Mnode', **kwargs) -> 'Mrow':
+        ''' Build an mrow from one line of a multiline mrow. The line
+            has already been split and had operator forms inferred,
+            so go straight to the single-line layout.
+        '''
+        mrowelm = ET.Element('mrow')
+        mrowelm.extend(line)
+        self = cls.__new__(cls)
+        Mnode.__init__(self, mrowelm, parent, **kwargs)
+        self._setup_single_line(line, **kwargs)
+        return self
+
     def _break_lines(self) -> list[list[ET.Element]]:
         ''' Break mrow into lines - to handle mspace linebreak (// in latex) '''
         lines = []
         line: list[ET.Element] = []
         for i, child in enumerate(self.element):
-            if child.tag == 'mi' and elementtext(child) in operators.names:
-                # Workaround for some latex2mathml operators coming back as identifiers
-                child.tag = 'mo'
-
+            retag_operator(child)
             if child.tag == 'mo':
                 infer_opform(i, child, self)
             if child.tag == 'mspace' and child.get('linebreak', None) == 'newline':
@@ -41,21 +53,20 @@ class Mrow(Mnode, tag='mrow'):
     def _setup_multilines(self, lines: list[list[ET.Element]], **kwargs) -> None:
         ''' Multiline mrow - process each line as an mrow so we can
             get its bounding box '''
-        node: Union[Mnode, Drawable]
-        for i, line in enumerate(lines):
-            mrowelm = ET.Element('mrow')
-            mrowelm.extend(line)
-            node = Mrow(mrowelm, parent=self)
-            self.nodes.append(node)
-
+        leading = 2 * self.units_to_points(self.font.consts.mathLeading)
         y = 0
-        for i, node in enumerate(self.nodes):
-            if i > 0:
-                y += (node.bbox.ymax - self.nodes[i-1].bbox.ymin +
-                      2 * self.units_to_points(self.font.math.consts.mathLeading))
+        xmin = inf
+        xmax = -inf
+        prev: Optional[Mrow] = None
+        for line in lines:
+            node = Mrow._from_line(line, parent=self)
+            if prev is not None:
+                y += node.bbox.ymax - prev.bbox.ymin + leading
+            self.nodes.append(node)
             self.nodexy.append((0, y))
-        xmin = min([n.bbox.xmin for n in self.nodes])
-        xmax = max([n.bbox.xmax for n in self.nodes])
+            xmin = min(xmin, node.bbox.xmin)
+            xmax = max(xmax, node.bbox.xmax)
+            prev = node
         ymin = -y+self.nodes[-1].bbox.ymin
         ymax = self.nodes[0].bbox.ymax
         self.bbox = BBox(xmin, xmax, ymin, ymax)
@@ -67,6 +78,8 @@ class Mrow(Mnode, tag='mrow'):
         height = kwargs.pop('height', None)
         i = 0
         x = xmin = xmax = 0.
+        # Postfix fences, found when the first prefix fence is reached
+        closers: Optional[list[tuple[int, str]]] = None
         while i < len(line):
             child = line[i]
             text = elementtext(child)
@@ -74,19 +87,19 @@ class Mrow(Mnode, tag='mrow'):
                 if (text in operators.fences
                         and child.get('form') == 'prefix'
                         and child.get('stretchy') != 'false'):
-                    fencekwargs = copy(kwargs)
-                    j = 0
-                    for j in range(i+1, len(self.element)):
-                        if (self.element[j].tag == 'mo'
-                                and self.element[j].get('form') == 'postfix'
-                                and elementtext(self.element[j]) in operators.fences):
-                            children = self.element[i+1: j]
-                            fencekwargs['open'] = elementtext(child)
-                            fencekwargs['close'] = elementtext(self.element[j])
-                            break
+                    fencekwargs = kwargs.copy()
+                    fencekwargs['open'] = text
+                    if closers is None:
+                        closers = [(k, elementtext(elm)) for k, elm in enumerate(self.element)
+                                   if elm.tag == 'mo' and elm.get('form') == 'postfix'
+                                   and elementtext(elm) in operators.fences]
+                    k = bisect(closers, (i, ''))
+                    if k < len(closers):
+                        j, fencekwargs['close'] = closers[k]
+                        children = self.element[i+1: j]
                     else:  # No postfix closing fence. Enclose remainder of row.
+                        j = len(self.element) - 1
                         children = self.element[i+1:]
-                        fencekwargs['open'] = elementtext(child)
                         fencekwargs['close'] = None
                     fencekwargs['separators'] = ''
                     fenced = ET.Element('mfenced')
@@ -108,15 +121,18 @@ class Mrow(Mnode, tag='mrow'):
 
             self.nodes.append(node)
             self.nodexy.append((x, 0))
-            xmax = max(xmax, x + node.bbox.xmax)
-            xmin = min([nxy[0]+n.bbox.xmin for nxy, n in zip(self.nodexy, self.nodes)])
-            ymax = max(ymax, node.bbox.ymax)
-            ymin = min(ymin, node.bbox.ymin)
+            nxmin, nxmax, nymin, nymax = node.bbox
+            xmax = max(xmax, x + nxmax)
+            if len(self.nodes) == 1:
+                xmin = x + nxmin
+            else:
+                xmin = min(xmin, x + nxmin)
+            ymax = max(ymax, nymax)
+            ymin = min(ymin, nymin)
             x += node.xadvance()
         self.bbox = BBox(xmin, xmax, ymin, ymax)
 
     def _setup(self, **kwargs) -> None:
-        kwargs = copy(kwargs)
         self.nodes = []
 
         lines = self._break_lines()
@@ -143,15 +159,17 @@ class Mrow(Mnode, tag='mrow'):
 
 class Merror(Mrow, tag='merror'):
     ''' Error node <merror>. Just an <mrow> with border and fill. '''
+    __slots__ = ()
+
     def draw(self, x: float, y: float, svg: ET.Element) -> tuple[float, float]:
         xend, yend = super().draw(x, y, svg)
-        border = ET.SubElement(svg, 'rect')
-        border.set('x', fmt(x + self.bbox.xmin - 1))
-        border.set('y', fmt(y - self.bbox.ymax - 1))
-        border.set('width', fmt((self.bbox.xmax - self.bbox.xmin)+2))
-        border.set('height', fmt((self.bbox.ymax - self.bbox.ymin)+2))
-        border.set('fill', 'yellow')
-        border.set('fill-opacity', '0.2')
-        border.set('stroke', 'red')
-        border.set('stroke-width', '1')
+        ET.SubElement(svg, 'rect', {
+            'x': fmt(x + self.bbox.xmin - 1),
+            'y': fmt(y - self.bbox.ymax - 1),
+            'width': fmt((self.bbox.xmax - self.bbox.xmin)+2),
+            'height': fmt((self.bbox.ymax - self.bbox.ymin)+2),
+            'fill': 'yellow',
+            'fill-opacity': '0.2',
+            'stroke': 'red',
+            'stroke-width': '1'})
         return xend, yend
\ No newline at end of file
@@ -9,6 +9,8 @@ from .mrow import Mrow
 
 class Mspace(Mnode, tag='mspace'):
     ''' Blank space '''
+    __slots__ = ('width', 'height', 'depth')
+
     def __init__(self, element: ET.Element, parent: 'Mnode', **kwargs):
         super().__init__(element, parent, **kwargs)
         self.width = self.size_px(element.get('width', '0'))
@@ -20,8 +22,26 @@ class Mspace(Mnode, tag='mspace'):
         self.bbox = BBox(0, self.width, -self.depth, self.height)
 
 
+def _adjust(node: Mnode, valstr: str, param: float) -> float:
+    ''' Apply an mpadded attribute value to param. Values may
+        be absolute, +X or -X increments, or percentages.
+    '''
+    sign = valstr[:1]
+    if sign == '+':
+        param += node.size_px(valstr[1:])
+    elif sign == '-':
+        param -= node.size_px(valstr[1:])
+    elif valstr.endswith('%'):
+        param *= float(valstr[:-1])/100
+    else:
+        param = node.size_px(valstr)
+    return param
+
+
 class Mpadded(Mrow, tag='mpadded'):
     ''' Mpadded element - Mrow with extra whitespace '''
+    __slots__ = ()
+
     def _setup(self, **kwargs):
         super()._setup(**kwargs)
         width = self.element.get('width', None)
@@ -31,39 +51,25 @@ class Mpadded(Mrow, tag='mpadded'):
         voffset = self.element.get('voffset', 0)
         xmin, xmax, ymin, ymax = self.bbox
 
-        def adjust(valstr: str, param: float) -> float:
-            if valstr.startswith('+') or valstr.startswith('-'):
-                # +X or -X means increment or decrement
-                sign = valstr[0]
-                if sign == '+':
-                    param += self.size_px(valstr[1:])
-                else:
-                    param -= self.size_px(valstr[1:])
-            elif valstr.endswith('%'):
-                param *= float(valstr[:-1])/100
-            else:
-                param = self.size_px(valstr)
-            return param
-
         if lspace:
-            xshift = adjust(lspace, 0)
-            for i, (x, y) in enumerate(self.nodexy):
-                self.nodexy[i] = (x + xshift, y)
+            xshift = _adjust(self, lspace, 0)
+            self.nodexy = [(x + xshift, y) for x, y in self.nodexy]
         if voffset:
-            yshift = adjust(voffset, 0)
-            for i, (x, y) in enumerate(self.nodexy):
-                self.nodexy[i] = (x, y-yshift)
+            yshift = _adjust(self, voffset, 0)
+            self.nodexy = [(x, y-yshift) for x, y in self.nodexy]
         if width:
-            xmax = xmin + adjust(width, xmax-xmin)
+            xmax = xmin + _adjust(self, width, xmax-xmin)
         if height:
-            ymax = adjust(height, ymax)
+            ymax = _adjust(self, height, ymax)
         if depth:
-            ymin = -adjust(depth, ymin)
+            ymin = -_adjust(self, depth, ymin)
         self.bbox = BBox(xmin, xmax, ymin, ymax)
 
 
 class Mphantom(Mrow, tag='mphantom'):
     ''' Phantom element. Takes up space but not drawn. '''
+    __slots__ = ()
+
     def _setup(self, **kwargs) -> None:
         kwargs['phantom'] = True
         super()._setup(**kwargs)
@@ -11,11 +11,12 @@ from .mnode import Mnode
 
 def place_super(base: Mnode, superscript: Mnode, font: MathFont) -> tuple[float, float, float]:
     ''' Superscript. Can be above the operator (like sum) or regular super '''
+    consts = font.consts
     if base.params.get('movablelimits') == 'true' and base.style.displaystyle:
         x = (-(base.bbox.xmax - base.bbox.xmin) / 2
              - (superscript.bbox.xmax - superscript.bbox.xmin) / 2)
         supy = (-base.bbox.ymax
-                - base.units_to_points(font.math.consts.upperLimitGapMin)
+                - base.units_to_points(consts.upperLimitGapMin)
                 + superscript.bbox.ymin)
         xadvance = 0.
     else:
@@ -31,9 +32,9 @@ def place_super(base: Mnode, superscript: Mnode, font: MathFont) -> tuple[float,
                     and base.lastchar() not in operators.integrals):
                 x += base.units_to_points(italicx)
 
-        shiftup = max(font.math.consts.superscriptShiftUp,
-                      -firstg.bbox.ymin + font.math.consts.superscriptBottomMin if firstg else 0,
-                      base.points_to_units(base.bbox.ymax) - font.math.consts.superscriptBaselineDropMax)
+        shiftup = max(consts.superscriptShiftUp,
+                      -firstg.bbox.ymin + consts.superscriptBottomMin if firstg else 0,
+                      base.points_to_units(base.bbox.ymax) - consts.superscriptBaselineDropMax)
 
         if superscript.mtag in ['mi', 'mn']:
             if firstg and lastg and lastg.index >= 0 and font.math.kernInfo:  # assembled glyphs have idx<0
@@ -47,10 +48,11 @@ def place_super(base: Mnode, superscript: Mnode, font: MathFont) -> tuple[float,
 
 def place_sub(base: Mnode, subscript: Mnode, font: MathFont) -> tuple[float, float, float]:
     ''' Calculate subscript. Can be below the operator (like sum) or regular sub '''
+    consts = font.consts
     if base.params.get('movablelimits') == 'true' and base.style.displaystyle:
         x = -(base.bbox.xmax - base.bbox.xmin) / 2 - (subscript.bbox.xmax - subscript.bbox.xmin) / 2
         suby = (-base.bbox.ymin
-                + base.units_to_points(font.math.consts.lowerLimitGapMin)
+                + base.units_to_points(consts.lowerLimitGapMin)
                 + subscript.bbox.ymax)
         xadvance = 0.
     else:
@@ -75,11 +77,11 @@ def place_sub(base: Mnode, subscript: Mnode, font: MathFont) -> tuple[float, flo
             x += base.units_to_points(kern)
 
         if base.mtag in ['mi', 'mn'] or (base.mtag == 'mo' and not base.string):  # type: ignore
-            shiftdn = font.math.consts.subscriptShiftDown
+            shiftdn = consts.subscriptShiftDown
         else:
-            shiftdn = max(font.math.consts.subscriptShiftDown,
-                      firstg.bbox.ymax - font.math.consts.subscriptTopMax if firstg else 0,
-                      font.math.consts.subscriptBaselineDropMin - base.points_to_units(base.bbox.ymin))
+            shiftdn = max(consts.subscriptShiftDown,
+                      firstg.bbox.ymax - consts.subscriptTopMax if firstg else 0,
+                      consts.subscriptBaselineDropMin - base.points_to_units(base.bbox.ymin))
         suby = base.units_to_points(shiftdn)
         xadvance = x + subscript.xadvance()
     return x, suby, xadvance
@@ -87,6 +89,8 @@ def place_sub(base: Mnode, subscript: Mnode, font: MathFont) -> tuple[float, flo
 
 class Msup(Mnode, tag='msup'):
     ''' Superscript Node '''
+    __slots__ = ('base', 'superscript')
+
     def __init__(self, element: ET.Element, parent: 'Mnode', **kwargs):
         super().__init__(element, parent, **kwargs)
         assert len(self.element) == 2
@@ -104,21 +108,25 @@ class Msup(Mnode, tag='msup'):
         supx, supy, xadv = place_super(self.base, self.superscript, self.font)
         self.nodes.append(self.superscript)
         self.nodexy.append((x+supx, supy))
-        if self.base.bbox.ymax > self.base.bbox.ymin:
-            xmin = min(self.base.bbox.xmin, x+supx+self.superscript.bbox.xmin)
-            xmax = max(x + xadv, self.base.bbox.xmax, x+supx+self.superscript.bbox.xmax)
-            ymin = min(self.base.bbox.ymin, -supy + self.superscript.bbox.ymin)
-            ymax = max(self.base.bbox.ymax, -supy + self.superscript.bbox.ymax)
+        bxmin, bxmax, bymin, bymax = self.base.bbox
+        sxmin, sxmax, symin, symax = self.superscript.bbox
+        if bymax > bymin:
+            xmin = min(bxmin, x+supx+sxmin)
+            xmax = max(x + xadv, bxmax, x+supx+sxmax)
+            ymin = min(bymin, -supy + symin)
+            ymax = max(bymax, -supy + symax)
         else:  # Empty base
-            xmin = self.superscript.bbox.xmin
+            xmin = sxmin
             ymin = -supy
             xmax = x + xadv
-            ymax = -supy + self.superscript.bbox.ymax
+            ymax = -supy + symax
         self.bbox = BBox(xmin, xmax, ymin, ymax)
 
 
 class Msub(Mnode, tag='msub'):
     ''' Subscript Node '''
+    __slots__ = ('base', 'subscript')
+
     def __init__(self, element: ET.Element, parent: 'Mnode', **kwargs):
         super().__init__(element, parent, **kwargs)
         assert len(self.element) == 2
@@ -137,15 +145,19 @@ class Msub(Mnode, tag='msub'):
         self.nodes.append(self.subscript)
         self.nodexy.append((x + subx, suby))
 
-        xmin = min(self.base.bbox.xmin, x+subx+self.subscript.bbox.xmin)
-        xmax = max(x + xadv, self.base.bbox.xmax, x+subx+self.subscript.bbox.xmax)
-        ymin = min(self.base.bbox.ymin, -suby+self.subscript.bbox.ymin)
-        ymax = max(self.base.bbox.ymax, -suby+self.subscript.bbox.ymax)
+        bxmin, bxmax, bymin, bymax = self.base.bbox
+        sxmin, sxmax, symin, symax = self.subscript.bbox
+        xmin = min(bxmin, x+subx+sxmin)
+        xmax = max(x + xadv, bxmax, x+subx+sxmax)
+        ymin = min(bymin, -suby+symin)
+        ymax = max(bymax, -suby+symax)
         self.bbox = BBox(xmin, xmax, ymin, ymax)
 
 
 class Msubsup(Mnode, tag='msubsup'):
     ''' Subscript and Superscript together '''
+    __slots__ = ('base', 'subscript', 'superscript')
+
     def __init__(self, element: ET.Element, parent: 'Mnode', **kwargs):
         super().__init__(element, parent, **kwargs)
         assert len(self.element) == 3
@@ -168,11 +180,14 @@ class Msubsup(Mnode, tag='msubsup'):
         supx, supy, xadvsup = place_super(self.base, self.superscript, self.font)
 
         # Ensure subSuperscriptGapMin between scripts
-        if ((suby - self.subscript.bbox.ymax) - (supy-self.superscript.bbox.ymin)
-                < self.units_to_points(self.font.math.consts.subSuperscriptGapMin)):
-            diff = (self.units_to_points(self.font.math.consts.subSuperscriptGapMin)
-                    - (suby - self.subscript.bbox.ymax)
-                    + (supy-self.superscript.bbox.ymin))
+        subbox = self.subscript.bbox
+        supbox = self.superscript.bbox
+        gapmin = self.units_to_points(self.font.consts.subSuperscriptGapMin)
+        if ((suby - subbox.ymax) - (supy-supbox.ymin)
+                < gapmin):
+            diff = (gapmin
+                    - (suby - subbox.ymax)
+                    + (supy-supbox.ymin))
             suby += diff/2
             supy -= diff/2
 
@@ -181,22 +196,25 @@ class Msubsup(Mnode, tag='msubsup'):
         self.nodes.append(self.superscript)
         self.nodexy.append((x + supx, supy))
 
-        if self.base.bbox.ymax > self.base.bbox.ymin:
-            xmin = self.base.bbox.xmin
+        basebox = self.base.bbox
+        if basebox.ymax > basebox.ymin:
+            xmin = basebox.xmin
             xmax = max(x + xadvsup, x + xadvsub)
-            ymin = min(-self.base.bbox.ymin, -suby + self.subscript.bbox.ymin)
-            ymax = max(self.base.bbox.ymax, -supy + self.superscript.bbox.ymax)
+            ymin = min(-basebox.ymin, -suby + subbox.ymin)
+            ymax = max(basebox.ymax, -supy + supbox.ymax)
         else:  # Empty base
             xmin = 0
             ymin = -suby
             xmax = x + max(xadvsub, xadvsup)
-            ymax = -supy + self.superscript.bbox.ymax
+            ymax = -supy + supbox.ymax
 
         self.bbox = BBox(xmin, xmax, ymin, ymax)
 
 
 class Mmultiscripts(Mnode, tag='mmultiscripts'):
     ''' Multiple sub/superscripts in one element '''
+    __slots__ = ('base', 'prescripts', 'postscripts')
+
     def __init__(self, element: ET.Element, parent: 'Mnode', **kwargs):
         super().__init__(element, parent, **kwargs)
 
@@ -213,8 +231,10 @@ class Mmultiscripts(Mnode, tag='mmultiscripts'):
         self._setup(**kwargs)
 
     def _setup(self, **kwargs):
-        ysub = self.units_to_points(self.font.math.consts.subscriptShiftDown)
-        ysup = -self.units_to_points(self.font.math.consts.superscriptShiftUp)
+        consts = self.font.consts
+        ysub = self.units_to_points(consts.subscriptShiftDown)
+        ysup = -self.units_to_points(consts.superscriptShiftUp)
+        scriptspace = self.units_to_points(consts.spaceAfterScript)
 
         x = xmax = 0
         ymax = self.base.bbox.ymax
@@ -235,7 +255,7 @@ class Mmultiscripts(Mnode, tag='mmultiscripts'):
             ymin = min(ymin, -ysub+subnode.bbox.ymin)
             xmax = max(xmax, x+width)
             x += width
-            x += self.units_to_points(self.font.math.consts.spaceAfterScript)
+            x += scriptspace
 
         self.nodes.append(self.base)
         self.nodexy.append((x, 0))
@@ -256,6 +276,6 @@ class Mmultiscripts(Mnode, tag='mmultiscripts'):
             ymin = min(ymin, -ysub+subnode.bbox.ymin)
             xmax = max(xmax, x+subnode.bbox.xmax, x+supnode.bbox.xmax)
             x += max(subnode.xadvance(), supnode.xadvance())
-            x += self.units_to_points(self.font.math.consts.spaceAfterScript)
+            x += scriptspace
 
         self.bbox = BBox(0, xmax, ymin, ymax)
@@ -1,21 +1,27 @@
 ''' <mtable> Math Element '''
+from __future__ import annotations
 from xml.etree import ElementTree as ET
 from collections import namedtuple
-from copy import copy
+from math import inf
+from operator import attrgetter
 
 from ziafont.fonttypes import BBox
 
 from . import Mnode
 
+_cell_ymin = attrgetter('node.bbox.ymin')
+_cell_ymax = attrgetter('node.bbox.ymax')
+
 
 class Mtable(Mnode, tag='mtable'):
     ''' Table node '''
+    __slots__ = ()
+
     def __init__(self, element: ET.Element, parent: 'Mnode', **kwargs):
         super().__init__(element, parent, **kwargs)
         self._setup(**kwargs)
 
     def _setup(self, **kwargs) -> None:
-        kwargs = copy(kwargs)
         rowspace = self.size_px('0.2em')
         colspace = self.size_px('0.2em')
         column_align_table = self.element.get('columnalign', 'center')
@@ -46,13 +52,20 @@ class Mtable(Mnode, tag='mtable'):
         # Compute size of each cell to size rows and columns
         rowheights = []  # Maximum height ABOVE baseline
         rowdepths = []   # Maximum distanve BELOW baseline
+        colwidths: list[float] = []
         for row in rows:
-            rowheights.append(max([cell.node.bbox.ymax for cell in row]))
-            rowdepths.append(min([cell.node.bbox.ymin for cell in row]))
-
-        colwidths = []
-        for col in [list(i) for i in zip(*rows)]:  # transposed
-            colwidths.append(max([cell.node.bbox.xmax - cell.node.bbox.xmin for cell in col]))
+            height = -inf
+            depth = inf
+            for c, cell in enumerate(row):
+                xmin, xmax, ymin, ymax = cell.node.bbox
+                height = max(height, ymax)
+                depth = min(depth, ymin)
+                if c < len(colwidths):
+                    colwidths[c] = max(colwidths[c], xmax - xmin)
+                else:  # Rows may have different numbers of cells
+                    colwidths.append(xmax - xmin)
+            rowheights.append(height)
+            rowdepths.append(depth)
 
         if self.element.get('equalrows') == 'true':
             rowheights = [max(rowheights)] * len(rows)
@@ -64,28 +77,28 @@ class Mtable(Mnode, tag='mtable'):
         # Compute baselines to each row
         totheight = sum(rowheights) - sum(rowdepths) + rowspace*(len(rows)-1)
         width = sum(colwidths) + colspace*len(colwidths)
-        ytop = -totheight/2 - self.units_to_points(self.font.math.consts.axisHeight)
+        ytop = -totheight/2 - self.units_to_points(self.font.consts.axisHeight)
         baselines = []
         y = ytop
         for h, d in zip(rowheights, rowdepths):
             baselines.append(y + h)
             y += h - d + rowspace
 
-        for r, row in enumerate(rows):
+        for row, baseline in zip(rows, baselines):
             x = colspace/2
-            for c, cell in enumerate(row):
-                self.nodes.append(cell.node)
-                cellw = cell.node.bbox.xmax - cell.node.bbox.xmin
-                if cell.columnalign == 'center':
-                    xcell = x + colwidths[c]/2-cellw/2
-                elif cell.columnalign == 'right':
-                    xcell = x + colwidths[c]-cellw
+            for (node, columnalign), colwidth in zip(row, colwidths):
+                self.nodes.append(node)
+                cellw = node.bbox.xmax - node.bbox.xmin
+                if columnalign == 'center':
+                    xcell = x + colwidth/2-cellw/2
+                elif columnalign == 'right':
+                    xcell = x + colwidth-cellw
                 else:
                     xcell = x
 
-                self.nodexy.append((xcell, baselines[r]))
-                x += colwidths[c] + colspace
+                self.nodexy.append((xcell, baseline))
+                x += colwidth + colspace
 
-        ymin = min([cell.node.bbox.ymin-baselines[-1] for cell in rows[-1]])
-        ymax = max([-baselines[0]+cell.node.bbox.ymax for cell in rows[0]])
+        ymin = min(map(_cell_ymin, rows[-1])) - baselines[-1]
+        ymax = -baselines[0] + max(map(_cell_ymax, rows[0]))
         self.bbox = BBox(0, width, ymin, ymax)
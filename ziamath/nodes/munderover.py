@@ -2,7 +2,6 @@
 from __future__ import annotations
 from typing import Optional, Union
 import xml.etree.ElementTree as ET
-from copy import copy
 
 from ziafont.fonttypes import BBox
 from ziafont.glyph import SimpleGlyph
@@ -14,7 +13,7 @@ from . import Mnode
 
 
 # Accents are drawn same scriptlevel as base
-ACCENTS = [
+ACCENTS = {
     0x005E,  # \hat, \widehat
     0x02D9,  # \dot
     0x02C7,  # \check
@@ -27,7 +26,7 @@ ACCENTS = [
     0x02D8,  # \breve
     0x00AF,  # \bar
     0x02DA,  # \mathring
-    ]
+    }
 
 
 def place_over(base: Mnode,
@@ -43,30 +42,34 @@ def place_over(base: Mnode,
         Returns:
             x, y: position for over node
     '''
+    basebox = base.bbox
+    overbox = over.bbox
+    mathtable = font.math
+
     # Center the node by default
-    x = (((base.bbox.xmax - base.bbox.xmin) - (over.bbox.xmax-over.bbox.xmin)) / 2
-         - over.bbox.xmin)
+    x = (((basebox.xmax - basebox.xmin) - (overbox.xmax-overbox.xmin)) / 2
+         - overbox.xmin)
     
     if ((lastg := base.lastglyph())
             and node_is_singlechar(base)
             and not isinstance(over, drawable.HLine)):
         # Italic adjustment and font-specific accent attachment,
         # if base is a single glyph
-        if (italicx := font.math.italicsCorrection.getvalue(lastg.index)):
+        if (italicx := mathtable.italicsCorrection.getvalue(lastg.index)):
             x += base.units_to_points(italicx)
 
         # Use font-specific accent attachment if defined
-        if (basex := font.math.topattachment(lastg.index)):
+        if (basex := mathtable.topattachment(lastg.index)):
             x = base.units_to_points(basex)
             
             if (node_is_singlechar(over)
-                    and (attachx := font.math.topattachment(over.lastglyph().index))):  # type: ignore
+                    and (attachx := mathtable.topattachment(over.lastglyph().index))):  # type: ignore
                 x -= over.units_to_points(attachx)
             else:
-                x -= (over.bbox.xmax-over.bbox.xmin)/2
+                x -= (overbox.xmax-overbox.xmin)/2
 
-    y = -base.bbox.ymax - base.units_to_points(font.math.consts.overbarVerticalGap)
-    y += over.bbox.ymin
+    y = -basebox.ymax - base.units_to_points(font.consts.overbarVerticalGap)
+    y += overbox.ymin
     return x, y
 
 
@@ -82,8 +85,10 @@ def place_under(base: Mnode,
         Returns:
             x, y: position for under node
     '''
-    x = (((base.bbox.xmax - base.bbox.xmin) - (under.bbox.xmax-under.bbox.xmin)) / 2
-         - under.bbox.xmin)
+    basebox = base.bbox
+    underbox = under.bbox
+    x = (((basebox.xmax - basebox.xmin) - (underbox.xmax-underbox.xmin)) / 2
+         - underbox.xmin)
 
     if ((lastg := base.lastglyph())
             and node_is_singlechar(base)
@@ -91,13 +96,15 @@ def place_under(base: Mnode,
         if (italicx := font.math.italicsCorrection.getvalue(lastg.index)):
             x -= base.units_to_points(italicx)
 
-    y = -base.bbox.ymin + base.units_to_points(font.math.consts.underbarVerticalGap)
-    y += (under.bbox.ymax)
+    y = -basebox.ymin + base.units_to_points(font.consts.underbarVerticalGap)
+    y += underbox.ymax
     return x, y
 
 
 class Mover(Mnode, tag='mover'):
     ''' Over node '''
+    __slots__ = ('base', 'over', '_isaccent', '_xadvance')
+
     # Over/underbar character. Fonts not consistent with using stretchy/assembled
     # glyphs, so draw with HLine instead of glyph.
     BAR = '―'  # 0x2015
@@ -106,24 +113,23 @@ class Mover(Mnode, tag='mover'):
         super().__init__(element, parent, **kwargs)
         self.over: Union[drawable.HLine, Mnode]
 
-        kwargs = copy(kwargs)
         assert len(self.element) == 2
         self.base = Mnode.fromelement(self.element[0], parent=self, **kwargs)
+        overtext = elementtext(self.element[1])
         if (self.element[1].tag in ['mover', 'munder']
-                or (self.element[1].tag == 'mo' and len(elementtext(self.element[1])) == 1)):
+                or (self.element[1].tag == 'mo' and len(overtext) == 1)):
             kwargs['width'] = self.base.bbox.xmax - self.base.bbox.xmin
 
         self._isaccent = False
-        if not (len(elementtext(self.element[1])) == 1
-                and ord(elementtext(self.element[1])) in ACCENTS):
+        if not (len(overtext) == 1 and ord(overtext) in ACCENTS):
             if self.element.get('accent', 'false').lower() == 'false':
                 self.increase_child_scriptlevel(self.element[1])
                 self._isaccent = True
 
-        if elementtext(self.element[1]) == self.BAR:
+        if overtext == self.BAR:
             self.over = drawable.HLine(
                 kwargs['width'],
-                self.units_to_points(self.font.math.consts.overbarRuleThickness))
+                self.units_to_points(self.font.consts.overbarRuleThickness))
         else:
             if self.element[1].get('stretchy') == 'true':
                 self.element[1].set('lspace', '0')
@@ -164,11 +170,12 @@ class Mover(Mnode, tag='mover'):
 
 class Munder(Mnode, tag='munder'):
     ''' Under node '''
+    __slots__ = ('base', 'under', '_isaccent')
+
     def __init__(self, element: ET.Element, parent: 'Mnode', **kwargs):
         super().__init__(element, parent, **kwargs)
         self.under: Union[drawable.HLine, Mnode]
 
-        kwargs = copy(kwargs)
         assert len(self.element) == 2
         self.base = Mnode.fromelement(self.element[0], parent=self, **kwargs)
         kwargs['sub'] = True
@@ -179,7 +186,7 @@ class Munder(Mnode, tag='munder'):
         if elementtext(self.element[1]) == Mover.BAR:
             self.under = drawable.HLine(
                 kwargs['width'],
-                self.units_to_points(self.font.math.consts.underbarRuleThickness))
+                self.units_to_points(self.font.consts.underbarRuleThickness))
         else:
             if self.element[1].get('stretchy') == 'true':
                 self.element[1].set('lspace', '0')
@@ -216,9 +223,10 @@ class Munder(Mnode, tag='munder'):
 
 class Munderover(Mnode, tag='munderover'):
     ''' Under bar and over bar '''
+    __slots__ = ('base', 'under', 'over')
+
     def __init__(self, element: ET.Element, parent: 'Mnode', **kwargs):
         super().__init__(element, parent, **kwargs)
-        kwargs = copy(kwargs)
         assert len(self.element) == 3
         self.base = Mnode.fromelement(self.element[0], parent=self, **kwargs)
         kwargs['sub'] = True
@@ -232,12 +240,12 @@ class Munderover(Mnode, tag='munderover'):
 
         kwargs.pop('width', None)
         kwargs.pop('sub', None)
+        overtext = elementtext(self.element[2])
         if (self.element[2].tag in ['mover', 'munder']
-                or (self.element[2].tag == 'mo' and len(elementtext(self.element[2])) == 1)):
+                or (self.element[2].tag == 'mo' and len(overtext) == 1)):
             kwargs['width'] = self.base.bbox.xmax - self.base.bbox.xmin
 
-        if not (len(elementtext(self.element[2])) == 1
-                and ord(elementtext(self.element[2])) in ACCENTS):
+        if not (len(overtext) == 1 and ord(overtext) in ACCENTS):
             if self.element[2].get('stretchy') == 'true':
                 self.element[2].set('lspace', '0')
                 self.element[2].set('rspace', '0')
@@ -1,16 +1,27 @@
 ''' Common tools for evaluating nodes '''
+from __future__ import annotations
 from typing import Union, TYPE_CHECKING
+from functools import lru_cache
 from xml.etree import ElementTree as ET
 
 from ziafont.glyph import SimpleGlyph
 
 from ..mathfont import MathFont
+from ..operators import names as _operator_names
 
 if TYPE_CHECKING:
     from .mnode import Mnode
     from ..drawable import Drawable
 
 
+def retag_operator(element: ET.Element) -> None:
+    ''' Change an <mi> element to <mo> if its text is a known operator.
+        Workaround for some latex2mathml operators coming back as identifiers.
+    '''
+    if element.tag == 'mi' and elementtext(element) in _operator_names:
+        element.tag = 'mo'
+
+
 def infer_opform(i: int, child: ET.Element, mrow: 'Mnode') -> None:
     ''' Infer form (prefix, postfix, infix) of operator child within
         element mrow. Appends 'form' attribute to child.
@@ -54,12 +65,31 @@ def node_is_singlechar(node: Union['Mnode', 'Drawable']) -> bool:
     return hasattr(node, 'string') and len(node.string) == 1  # type:ignore
 
 
+def gsub_state(font: MathFont) -> tuple:
+    ''' Font state that GSUB substitution depends on: the feature
+        flags and the current script/language. Used to key caches
+        of substituted glyphs.
+    '''
+    if not font.gsub:
+        return ()
+    language = font.gsub.language
+    return (tuple(vars(font.features).values()), language.script, language.language)
+
+
 def subglyph(glyph: SimpleGlyph, font: MathFont) -> SimpleGlyph:
     ''' Substitute glyphs using font GSUB ssty feature. This
         substitutes glyphs like \prime for use in sub/superscripts.
     '''
     if font.gsub:
-        glyphids = font.gsub.sub([glyph.index], font.features)
-        if glyphids[0] != glyph.index:
-            glyph = font.glyph_fromid(glyphids[0])
+        glyphid = _subglyph_id(font, glyph.index, gsub_state(font))
+        if glyphid != glyph.index:
+            glyph = font.glyph_fromid(glyphid)
     return glyph
+
+
+@lru_cache(maxsize=1024)
+def _subglyph_id(font: MathFont, glyphid: int, state: tuple) -> int:
+    ''' GSUB substitution of a single glyph. state is the font's
+        gsub_state(), used only to key the cache.
+    '''
+    return font.gsub.sub([glyphid], font.features)[0]
@@ -7,6 +7,7 @@
     https://www.w3.org/TR/MathML2/appendixf.html
 '''
 from __future__ import annotations
+from functools import lru_cache
 
 
 operators = {
@@ -354,16 +355,16 @@ operators = {
 
 
 integrals = ['∫', '∬', '∭', '∲', '∮', '∳', '∯', '∰', ]
-fences = [op[0] for op, params in operators.items() if params.get('fence') == 'true'] + ['|', '∣', '❘', '‖']
+fences = (set(op[0] for op, params in operators.items() if params.get('fence') == 'true')
+          | {'|', '∣', '❘', '‖'})
 names = set(op[0] for op in operators.keys())
 
 
-def get_params(name: str, form: str) -> dict[str, str]:
-    ''' Get parameters for the given operator name and form '''
-    if form == 'none':
-        # form of 'none' is given to single element mrows like {,}
-        return {}
-
+@lru_cache(maxsize=256)
+def _lookup_params(name: str, form: str) -> dict[str, str]:
+    ''' Find the dictionary entry for the operator, falling back
+        to other forms. Returns the shared entry - do not modify.
+    '''
     params = operators.get((name, form), {})
     if not params:
         params = operators.get((name, 'infix'), {})
@@ -371,5 +372,12 @@ def get_params(name: str, form: str) -> dict[str, str]:
         params = operators.get((name, 'postfix'), {})
     if not params:
         params = operators.get((name, 'prefix'), {})
+    return params
 
-    return params.copy()
+
+def get_params(name: str, form: str) -> dict[str, str]:
+    ''' Get parameters for the given operator name and form '''
+    if form == 'none':
+        # form of 'none' is given to single element mrows like {,}
+        return {}
+    return _lookup_params(name, form).copy()
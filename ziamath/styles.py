@@ -3,9 +3,10 @@
     this does not check whether the new character glyph exists in the font.
 '''
 from __future__ import annotations
-from typing import Any, MutableMapping
-from collections import ChainMap, namedtuple
-from dataclasses import dataclass, field, asdict
+from typing import Any, Mapping, Optional
+from collections import namedtuple
+from dataclasses import dataclass, field
+from functools import lru_cache
 from xml.etree import ElementTree as ET
 
 from .config import config
@@ -35,22 +36,32 @@ class MathStyle:
     scriptlevel: int = 0
 
 
-def parse_variant(variant: str, parent_variant: MathVariant) -> MathVariant:
-    ''' Extract mathvariant from MathML attribute and parent's variant '''
-    bold = True if 'bold' in variant else parent_variant.bold
-    italic = True if 'italic' in variant else parent_variant.italic
-    normal = True if 'normal' in variant else parent_variant.normal
+_DEFAULT_VARIANT = MathVariant()  # Never modified
+
 
+@lru_cache(maxsize=64)
+def _variant_flags(variant: str) -> tuple[bool, bool, bool, Optional[str]]:
+    ''' Bold, italic, and normal flags, and style name (None if not
+        a known style), for a mathvariant attribute value
+    '''
+    bold = 'bold' in variant
+    italic = 'italic' in variant
+    normal = 'normal' in variant
     variant = variant.replace('bold', '').replace('italic', '').strip()
-    if variant in VARIANTS:
-        style = variant
-    else:
-        style = parent_variant.style
+    style = variant if variant in VARIANTS else None
+    return bold, italic, normal, style
 
-    return MathVariant(style=style, italic=italic, bold=bold, normal=normal)
+
+def parse_variant(variant: str, parent_variant: MathVariant) -> MathVariant:
+    ''' Extract mathvariant from MathML attribute and parent's variant '''
+    bold, italic, normal, style = _variant_flags(variant)
+    return MathVariant(style=style or parent_variant.style,
+                       italic=italic or parent_variant.italic,
+                       bold=bold or parent_variant.bold,
+                       normal=normal or parent_variant.normal)
 
 
-def parse_displaystyle(params: MutableMapping[str, Any]) -> bool:
+def parse_displaystyle(params: Mapping[str, Any]) -> bool:
     ''' Extract displaystyle mode from MathML attributes '''
     dstyle = True
     if 'displaystyle' in params:
@@ -62,23 +73,24 @@ def parse_displaystyle(params: MutableMapping[str, Any]) -> bool:
 
 def parse_style(element: ET.Element, parent_style: MathStyle = None) -> MathStyle:
     ''' Read element style attributes into MathStyle '''
-    params: MutableMapping[str, Any]
+    attrib = element.attrib
     if parent_style:
-        params = ChainMap(element.attrib, asdict(parent_style))
+        # Attributes not set on the element are inherited from the parent
+        mathcolor = attrib.get('mathcolor', parent_style.mathcolor)
+        mathbackground = attrib.get('mathbackground', parent_style.mathbackground)
+        mathsize = attrib.get('mathsize', parent_style.mathsize)
+        scriptlevel = int(attrib.get('scriptlevel', parent_style.scriptlevel))
+        displaystyle = attrib.get('displaystyle', parent_style.displaystyle) in ['true', True]
         parent_variant = parent_style.mathvariant
     else:
-        params = element.attrib
-        parent_variant = MathVariant()
-
-    args: dict[str, Any] = {}
-    args['mathcolor'] = params.get('mathcolor', config.math.color)
-    args['mathbackground'] = params.get('mathbackground', config.math.background)
-    args['mathsize'] = params.get('mathsize', '')
-    args['scriptlevel'] = int(params.get('scriptlevel', 0))
-    args['mathvariant'] = parse_variant(element.attrib.get('mathvariant', config.math.variant), parent_variant) 
-    args['displaystyle'] = parse_displaystyle(params)
-    
-    css = params.get('style', '')
+        mathcolor = attrib.get('mathcolor', config.math.color)
+        mathbackground = attrib.get('mathbackground', config.math.background)
+        mathsize = attrib.get('mathsize', '')
+        scriptlevel = int(attrib.get('scriptlevel', 0))
+        displaystyle = parse_displaystyle(attrib)
+        parent_variant = _DEFAULT_VARIANT
+
+    css = attrib.get('style', '')
     if css:
         cssparams = css.split(';')
         for cssparam in cssparams:
@@ -88,10 +100,17 @@ def parse_style(element: ET.Element, parent_style: MathStyle = None) -> MathStyl
             key = key.strip()
             val = val.strip()
             if key.lower() == 'background':
-                args['mathbackground'] = val
+                mathbackground = val
             elif key.lower() == 'color':
-                args['mathcolor'] = val
-    return MathStyle(**args)
+                mathcolor = val
+
+    return MathStyle(
+        mathvariant=parse_variant(attrib.get('mathvariant', config.math.variant), parent_variant),
+        displaystyle=displaystyle,
+        mathcolor=mathcolor,
+        mathbackground=mathbackground,
+        mathsize=mathsize,
+        scriptlevel=scriptlevel)
 
 
 LATIN_CAP_RANGE = (0x41, 0x5A)
@@ -269,4 +288,11 @@ def styledchr(char, variant: MathVariant):
 
 def styledstr(st: str, variant: MathVariant) -> str:
     ''' Apply unicode styling conversion to a string '''
+    return _styledstr(st, variant.style, variant.bold, variant.italic)
+
+
+@lru_cache(maxsize=4096)
+def _styledstr(st: str, style: str, bold: bool, italic: bool) -> str:
+    # Only style, bold, and italic affect the conversion
+    variant = MathVariant(style=style, italic=italic, bold=bold)
     return ''.join([styledchr(s, variant) for s in st])
@@ -1,10 +1,11 @@
 ''' Main math rendering class '''
 
 from __future__ import annotations
-from typing import Union, Literal, Tuple, Optional, Dict
+from typing import Union, Literal, Tuple, Optional, Dict, Iterable
 import warnings
 import re
 from collections import ChainMap
+from copy import deepcopy
 from math import inf, cos, sin, radians
 from itertools import zip_longest
 import importlib.resources as pkg_resources
@@ -15,7 +16,7 @@ import latex2mathml.commands  # type: ignore
 
 import ziafont as zf
 from ziafont.glyph import fmt
-from .mathfont import MathFont
+from .mathfont import MathFont, load_mathfont
 from .nodes import Mnode
 from .styles import parse_style
 from .escapes import unescape
@@ -47,6 +48,16 @@ def declareoperator(name: str) -> None:
     latex2mathml.commands.FUNCTIONS = latex2mathml.commands.FUNCTIONS + (name,)
 
 
+def declareoperators(names: Iterable[str]) -> None:
+    r''' Declare several new operator names at once.
+
+        Args:
+            names: Names of operators, each starting with a ``\``.
+                Example: ``declareoperators([r'\myfunc', r'\otherfunc'])``
+    '''
+    latex2mathml.commands.FUNCTIONS = latex2mathml.commands.FUNCTIONS + tuple(names)
+
+
 def tex2mml(tex: str, inline: bool = False) -> str:
     ''' Convert Latex to MathML. Do some hacky preprocessing to work around
         some issues with generated MathML that ziamath doesn't support yet.
@@ -78,12 +89,19 @@ def apply_mstyle(element: ET.Element) -> ET.Element:
                 child.attrib = dict(ChainMap(child.attrib, element.attrib))
             flatten_attrib(child)
 
-    flatten_attrib(element)
+    def unwrap(element: ET.Element) -> None:
+        children = []
+        for child in element:
+            unwrap(child)
+            if child.tag == 'mstyle':
+                children.extend(child)
+            else:
+                children.append(child)
+        element[:] = children
 
-    elmstr = ET.tostring(element).decode('utf-8')
-    elmstr = re.sub(r'<mstyle.+?>', '', elmstr)
-    elmstr = re.sub(r'</mstyle>', '', elmstr)
-    return ET.fromstring(elmstr)
+    flatten_attrib(element)
+    unwrap(element)
+    return element
 
 
 class Math:
@@ -105,12 +123,13 @@ class Math:
         elif font in loadedfonts:
             self.font = loadedfonts[font]
         else:
-            self.font = MathFont(font, self.size)
-            loadedfonts[font] = self.font
+            self.font = load_mathfont(font, self.size)
 
         if isinstance(mathml, str):
             mathml = unescape(mathml)
             mathml = ET.fromstring(mathml)
+        else:
+            mathml = deepcopy(mathml)  # Don't modify the caller's element
         mathml = denamespace(mathml)
         mathml = apply_mstyle(mathml)
 
@@ -226,7 +245,7 @@ class Math:
         width, height = self.getsize()
         yshift = {'top': self.node.bbox.ymax,
                   'center': height/2 + self.node.bbox.ymin,
-                  'axis': self.node.units_to_points(self.font.math.consts.axisHeight),
+                  'axis': self.node.units_to_points(self.font.consts.axisHeight),
                   'bottom': self.node.bbox.ymin}.get(valign, 0)
         xshift = {'center': -width/2,
                   'right': -width}.get(halign, 0)
@@ -382,14 +401,16 @@ class Text:
                 valign: Vertical alignment
         '''
         svgelm, _ = self._drawon(svg, x, y, halign, valign)
-        return svgelm
+        return svgelm  # type: ignore
 
-    def _drawon(self, svg: ET.Element, x: float = 0, y: float = 0,
-                halign: str = None, valign: str = None) -> Tuple[ET.Element, Tuple[float, float, float, float]]:
+    def _drawon(self, svg: Optional[ET.Element], x: float = 0, y: float = 0,
+                halign: str = None, valign: str = None
+                ) -> Tuple[Optional[ET.Element], Tuple[float, float, float, float]]:
         ''' Draw text on existing SVG element
 
             Args:
-                svg: Element to draw on
+                svg: Element to draw on. If None, only the bounding
+                    box is calculated and nothing is drawn.
                 x: x-position
                 y: y-position
                 halign: Horizontal alignment
@@ -400,7 +421,7 @@ class Text:
 
         lines = self.str.splitlines()
         svglines = []
-        svgelm = ET.SubElement(svg, 'g')
+        svgelm = ET.SubElement(svg, 'g') if svg is not None else None
 
         # Split into lines and "parts"
         linesizes = []
@@ -483,9 +504,10 @@ class Text:
             yloc -= drop
             ymin = min(ymin, yloc-lineheights[i])
             ymax = max(ymax, yloc-lineofsts[i])
-            for part, size in zip(line, linesizes[i]):
-                part.drawon(svgelm, xloc, yloc)
-                xloc += size[0]
+            if svgelm is not None:
+                for part, size in zip(line, linesizes[i]):
+                    part.drawon(svgelm, xloc, yloc)
+                    xloc += size[0]
             yloc += lineheights[i] * self.linespacing
 
         if self.rotation:
@@ -515,12 +537,12 @@ class Text:
                       'bottom': y - bbox[3],
                       'base': -sinth*dx,
                       'center': y - (bbox[3]+bbox[2])/2}.get(valign, 0)
-                xform = f'translate({dx} {dy})'
+                xform = f'translate({fmt(dx)} {fmt(dy)})'
                 bbox = (bbox[0]+dx, bbox[1]+dx,
                         bbox[2]+dy, bbox[3]+dy)
 
-            xform += f' rotate({-self.rotation} {x} {y})'
-            if config.debug.bbox:
+            xform += f' rotate({fmt(-self.rotation)} {fmt(x)} {fmt(y)})'
+            if config.debug.bbox and svg is not None:
                 rect = ET.SubElement(svg, 'rect')
                 rect.attrib['x'] = fmt(bbox[0])
                 rect.attrib['y'] = fmt(bbox[2])
@@ -529,25 +551,28 @@ class Text:
                 rect.attrib['fill'] = 'none'
                 rect.attrib['stroke'] = 'red'
 
-            svgelm.set('transform', xform)
+            if svgelm is not None:
+                svgelm.set('transform', xform)
             xmin, xmax, ymin, ymax = bbox
 
         return svgelm, (xmin, xmax, ymin, ymax)
 
     def getsize(self):
         ''' Get pixel width and height of Text. '''
-        svg = ET.Element('svg')
-        _, (xmin, xmax, ymin, ymax) = self._drawon(svg)
+        _, (xmin, xmax, ymin, ymax) = self._drawon(None)
         return (xmax-xmin, ymax-ymin)
 
     def bbox(self):
         ''' Get bounding box (xmin, xmax, ymin, ymax) of Text. '''
-        svg = ET.Element('svg')
-        _, (xmin, xmax, ymin, ymax) = self._drawon(svg)
+        _, (xmin, xmax, ymin, ymax) = self._drawon(None)
         return (xmin, xmax, ymin, ymax)
 
 
-# Cache the loaded fonts to prevent reloading all the time
+# Default font, always loaded. Other fonts are cached by load_mathfont.
 with pkg_resources.path('ziamath.fonts', 'STIXTwoMath-Regular.ttf') as p:
     fontname = p
-loadedfonts: Dict[str, MathFont] = {'default': MathFont(fontname)}
+loadedfonts: Dict[str, MathFont] = {'default': load_mathfont(fontname)}
+
+
+declareoperators([r'\tg', r'\ctg', r'\arcctg', r'\arctg', r'\arg',
+                  r'\cotg', r'\sh', r'\ch', r'\cth', r'\th'])